@@ -0,0 +1,118 @@
+import math
+import os
+import random
+
+from engine import SCALE_MAX, VARIABLES
+
+# =========================================================
+# Adaptive questioning (no Streamlit)
+# - each variable's true mean signal gets a Normal posterior from its answers
+# - P(variable is the lowest) by numeric integration over those posteriors
+# - next question: from the variable whose next answer is expected to shrink
+#   the uncertainty (entropy) about which variable is lowest the most
+# - stop once one variable is the lowest with CONFIDENCE, every variable has
+#   MIN_PER_VARIABLE answers, or MAX_QUESTIONS were asked
+# Override the confidence with TRIFACTOR_ADAPTIVE_CONFIDENCE=0.95
+# =========================================================
+
+CONFIDENCE = float(os.environ.get("TRIFACTOR_ADAPTIVE_CONFIDENCE", "0.9"))
+MIN_PER_VARIABLE = 2
+MAX_QUESTIONS = 25  # never more than the fixed-length mode
+
+PRIOR_MEAN = SCALE_MAX / 2
+PRIOR_VAR = 1.0  # spread of a variable's true mean before any answers
+NOISE_VAR = 1.5  # spread of single answers around it...
+NOISE_PSEUDO = 2  # ...worth this many answers when blended with the observed spread
+GRID = 61  # integration points
+
+# Probabilists' 3-point Gauss-Hermite: E[f(Z)] for Z ~ N(0, 1)
+_GH = ((-math.sqrt(3), 1 / 6), (0.0, 2 / 3), (math.sqrt(3), 1 / 6))
+
+
+def _posterior(count, mean, m2):
+    # (posterior mean, posterior variance, per-answer noise variance)
+    if not count:
+        return PRIOR_MEAN, PRIOR_VAR, NOISE_VAR
+    noise = (m2 + NOISE_PSEUDO * NOISE_VAR) / (count + NOISE_PSEUDO)
+    precision = 1 / PRIOR_VAR + count / noise
+    return (PRIOR_MEAN / PRIOR_VAR + count * mean / noise) / precision, 1 / precision, noise
+
+
+def lowest_probabilities(posteriors):
+    """{variable: P(lowest)} for {variable: (mean, variance)} of independent Normals."""
+    names = list(posteriors)
+    if len(names) < 2:
+        return dict.fromkeys(names, 1.0)
+    means = [posteriors[v][0] for v in names]
+    sds = [math.sqrt(posteriors[v][1]) for v in names]
+    lo = min(m - 5 * s for m, s in zip(means, sds))
+    hi = max(m + 5 * s for m, s in zip(means, sds))
+    step = (hi - lo) / (GRID - 1)
+    probs = [0.0] * len(names)
+    for g in range(GRID):
+        x = lo + g * step
+        z = [(x - m) / s for m, s in zip(means, sds)]
+        survive = [0.5 * math.erfc(zi / math.sqrt(2)) for zi in z]  # P(X_v > x)
+        for i, zi in enumerate(z):
+            others = 1.0
+            for j, sv in enumerate(survive):
+                if j != i:
+                    others *= sv
+            probs[i] += math.exp(-0.5 * zi * zi) / sds[i] * others
+    total = sum(probs) or 1.0
+    return {v: p / total for v, p in zip(names, probs)}
+
+
+def _entropy(probs):
+    return -sum(p * math.log(p) for p in probs.values() if p > 0)
+
+
+def _state(cb, running):
+    # Posteriors for every variable this lens can score
+    stats = running.signal_stats()
+    return {v: _posterior(*stats.get(v, (0, 0.0, 0.0))) for v in VARIABLES if cb.by_variable[v]}
+
+
+def assess(cb, running, asked_count, confidence=CONFIDENCE, max_questions=MAX_QUESTIONS):
+    """(weakest variable, P(it is the lowest), done) for the answers so far."""
+    state = _state(cb, running)
+    probs = lowest_probabilities({v: (m, var) for v, (m, var, _n) in state.items()})
+    weakest = max(probs, key=probs.get)
+    stats = running.signal_stats()
+    covered = all(stats.get(v, (0,))[0] >= MIN_PER_VARIABLE for v in state)
+    done = asked_count >= max_questions or (covered and probs[weakest] >= confidence)
+    return weakest, probs[weakest], done
+
+
+def next_position(cb, asked, running, rng=random):
+    """Position of the most informative unasked question, or None if there is none left."""
+    available = {v: [i for i in cb.by_variable[v] if i not in asked] for v in VARIABLES}
+    available = {v: ix for v, ix in available.items() if ix}
+    if not available:
+        return None
+
+    stats = running.signal_stats()
+    short = [v for v in available if stats.get(v, (0,))[0] < MIN_PER_VARIABLE]
+    if short:
+        # Cover every variable first, fewest answers first
+        fewest = min(stats.get(v, (0,))[0] for v in short)
+        variable = rng.choice([v for v in short if stats.get(v, (0,))[0] == fewest])
+    else:
+        state = _state(cb, running)
+
+        def expected_entropy(v):
+            # One more answer on v: its variance shrinks, its mean moves by a Normal amount
+            m, var, noise = state[v]
+            new_var = 1 / (1 / var + 1 / noise)
+            shift = math.sqrt(max(var - new_var, 0.0))
+            out = 0.0
+            for z, w in _GH:
+                post = {u: (mu, vu) for u, (mu, vu, _n) in state.items()}
+                post[v] = (m + z * shift, new_var)
+                out += w * _entropy(lowest_probabilities(post))
+            return out
+
+        variable = min(available, key=expected_entropy)
+
+    candidates = available[variable]
+    return rng.choices(candidates, weights=[cb.weights[i] for i in candidates])[0]
@@ -0,0 +1,119 @@
+import numpy as np
+
+from engine import SCALE_MAX, VARIABLE_WEIGHTS, VARIABLES, CompiledBank, compiled_bank
+
+# =========================================================
+# Vectorized batch scoring (N respondents x Q questions)
+# - Same math as engine.compute_scores, one pass for all N rows
+# - Unanswered cells are UNANSWERED (-1)
+# =========================================================
+
+ZONES = ("RED", "YELLOW", "GREEN")
+UNANSWERED = -1
+CHUNK_ROWS = 65536  # rows scored per matmul pass
+
+
+def answers_matrix(questions, answer_dicts):
+    # [{qid: 0..4}, ...] -> int8 (N, Q) aligned to `questions` (a list or a CompiledBank)
+    col = questions.index if isinstance(questions, CompiledBank) else {q["id"]: j for j, q in enumerate(questions)}
+    out = np.full((len(answer_dicts), len(col)), UNANSWERED, dtype=np.int8)
+    for i, answers in enumerate(answer_dicts):
+        for qid, a in answers.items():
+            j = col.get(qid)
+            if j is not None:
+                out[i, j] = a
+    return out
+
+
+def zone_codes(pct):
+    # 0=RED, 1=YELLOW, 2=GREEN (same 45/70 cut points as engine.zone_name)
+    zone = (pct >= 45).view(np.int8)
+    return zone + (pct >= 70).view(np.int8)
+
+
+def score_matrix(answers, questions=None, lens=None):
+    """Score many runs at once.
+
+    `answers` is (N, Q) with 0..4 per cell (or UNANSWERED), columns aligned
+    to `questions` (defaults to the compiled bank for `lens`). Returns a dict of arrays:
+    - overall: (N,)
+    - pct, volatility: (N, V) in VARIABLES order, NaN where a variable has no answers
+    - zone: (N, V) int8 codes into ZONES (-1 where pct is NaN)
+    """
+    cb = compiled_bank(lens) if questions is None else CompiledBank(lens, questions)
+    a = np.asarray(answers)
+    if a.ndim != 2 or a.shape[1] != len(cb):
+        raise ValueError(f"answers must be (N, {len(cb)}), got {a.shape}")
+
+    onehot = np.zeros((len(cb), len(VARIABLES)))
+    onehot[np.arange(len(cb)), np.frombuffer(cb.var_codes, dtype=np.int8)] = 1.0
+    weight = np.frombuffer(cb.weights, dtype=np.float64)
+    reverse = np.frombuffer(cb.reverse, dtype=np.int8).astype(bool)
+
+    # Fold the reverse flip into the projections so each chunk is three small matmuls.
+    # Per cell: s = a or 4 - a, s^2 = a^2 or 16 - 8a + a^2.
+    # Inputs are a, a^2 and the answered mask; output blocks are
+    # [weighted score, weight sum, count, sum of s, sum of s^2] per variable.
+    # float64 throughout: sums of integer signals stay exact, so 45/70 land in the same zone as the engine
+    rev = reverse[:, None].astype(np.float64)
+    sign = 1.0 - 2.0 * rev
+    weighted = onehot * weight[:, None]
+    top = SCALE_MAX * rev
+    from_a = np.hstack([weighted * sign, onehot * sign, -2.0 * top * onehot]).T
+    from_mask = np.hstack([weighted * top, weighted, onehot, onehot * top, top * top * onehot]).T
+    from_sq = onehot.T
+
+    # Work in (5V, N) so every per-variable block below is a contiguous row slice;
+    # rows go through in chunks so the float64 copies of `a` stay small
+    nv = len(VARIABLES)
+    agg = np.empty((5 * nv, len(a)))
+    for lo in range(0, len(a), CHUNK_ROWS):
+        chunk = a[lo : lo + CHUNK_ROWS]
+        answered = (chunk >= 0).T.astype(np.float64)
+        x = np.clip(chunk, 0, SCALE_MAX).T.astype(np.float64)
+        x *= answered
+        out = agg[:, lo : lo + len(chunk)]
+        np.matmul(from_mask, answered, out=out)
+        from_x = from_a @ x
+        out[:nv] += from_x[:nv]
+        out[3 * nv :] += from_x[nv:]
+        x *= x
+        out[4 * nv :] += from_sq @ x
+    wscore, wsum, count, total, sumsq = np.vsplit(agg, 5)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = wscore / wsum
+        pct *= 100.0 / SCALE_MAX
+        # Same M2 as compute_scores (exact: signals are ints), then pstdev
+        var = count * sumsq
+        var -= total * total
+        var /= count * count
+    np.maximum(var, 0.0, out=var)
+    # pstdev on a 0..4 scale tops out at 2 -> map to 0..100; needs >= 2 answers
+    volatility = np.sqrt(var, out=var)
+    volatility *= 100.0 / (SCALE_MAX / 2)
+    volatility[count < 2] = 0.0
+    # Round like engine.variable_score, so zone edges and ties match a single-run score
+    np.round(pct, 9, out=pct)
+    np.round(volatility, 9, out=volatility)
+    missing = count == 0
+    pct[missing] = np.nan
+    volatility[missing] = np.nan
+
+    vw = np.array([VARIABLE_WEIGHTS[v] for v in VARIABLES])
+    present = ~missing
+    vw_total = vw @ present
+    with np.errstate(invalid="ignore", divide="ignore"):
+        overall = (vw @ np.where(present, pct, 0.0)) / vw_total
+    overall[vw_total == 0] = 0.0
+
+    zone = zone_codes(pct)
+    zone[missing] = -1
+
+    return {
+        "overall": overall,
+        "pct": pct.T,
+        "zone": zone.T,
+        "volatility": volatility.T,
+        "variables": VARIABLES,
+    }
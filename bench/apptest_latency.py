@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+APP = str(ROOT / "app.py")
+
+# =========================================================
+# Per-rerun latency of app.py, headless (streamlit.testing AppTest)
+# - walks setup -> questions (25) -> results -> followups (10)
+#   -> export_form -> results2, timing every script run
+# - reports p50/p99 per stage and per click; --sessions runs many
+#   walks, --concurrency of them at once. AppTest isn't thread-safe, so
+#   concurrent walks run one per worker process and their samples are merged
+#   (the server's threads share one process; this doesn't model the GIL contention)
+# - AppTest re-runs the whole script on every click, including the clicks
+#   that are fragment-only reruns in production (answer/next in questions
+#   and followups), so those per-click numbers overstate real latency
+# - runs are saved to throwaway SQLite files, not trifactor_runs.db
+# - with TRIFACTOR_QUESTION_PAGE_SIZE set, questions are walked page by page
+# Usage: python bench/apptest_latency.py [--sessions 20] [--concurrency 4] [--json out.json]
+# =========================================================
+
+TIMEOUT = 30  # seconds per script run before AppTest gives up
+PAGE_SIZE = int(os.environ.get("TRIFACTOR_QUESTION_PAGE_SIZE", "0") or 0)  # read by the app too
+STAGES = ("setup", "questions", "results", "followups", "export_form", "results2")
+
+
+class Session:
+    """One simulated user: an AppTest plus the timings of every run it triggered."""
+
+    def __init__(self, seed):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = random.Random(seed)
+        self.at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+        self.samples = []  # (stage, action, seconds)
+
+    @property
+    def stage(self):
+        return self.at.session_state["stage"]
+
+    def timed(self, action, run):
+        # `run` triggers exactly one script run; the sample is filed under the stage it started in
+        stage = self.stage if "stage" in self.at.session_state else "setup"
+        t0 = time.perf_counter()
+        run()
+        self.samples.append((stage, action, time.perf_counter() - t0))
+        if self.at.exception:
+            raise RuntimeError(f"{stage}/{action}: {self.at.exception[0].message}")
+
+    def click(self, key, action):
+        self.timed(action, lambda: self.at.button(key=key).click().run())
+
+    def answer(self):
+        # The question card's radio is the only one on screen in the question stages
+        self.timed("answer", lambda: self.at.radio[0].set_value(self.rng.randint(0, 4)).run())
+
+    def answer_pages(self):
+        # Form mode: radios change without a run; each page is one submit
+        while self.stage == "questions":
+            for radio in self.at.radio:
+                radio.set_value(self.rng.randint(0, 4))
+            labels = {b.label: b for b in self.at.button}
+            action = "next" if "Next page" in labels else "finish"
+            self.timed(action, labels["Next page" if action == "next" else "Finish & Score"].click().run)
+
+    def expect(self, stage):
+        if self.stage != stage:
+            raise RuntimeError(f"expected stage {stage!r}, app is at {self.stage!r}")
+
+    def walk(self):
+        self.timed("load", self.at.run)
+        self.click("btn_start_25_v1", "start")
+        self.expect("questions")
+
+        if PAGE_SIZE:
+            self.answer_pages()
+        else:
+            total = self.at.session_state["run"].base_count
+            for i in range(total):
+                self.answer()
+                if i < total - 1:
+                    self.click(f"btn_next_{i}_v1", "next")
+            self.click("btn_finish_score_v1", "finish")
+        self.expect("results")
+
+        self.timed("rerun", self.at.run)
+        self.click("btn_continue_fu_v1", "continue")
+        self.expect("followups")
+
+        total = self.at.session_state["run"].followup_count
+        for i in range(total):
+            self.answer()
+            if i < total - 1:
+                self.click(f"btn_fu_next_{i}_v1", "next")
+        self.click("btn_fu_finish_v1", "finish")
+        self.expect("export_form")
+
+        self.timed("rerun", self.at.run)
+        self.click("btn_continue_results2_v1", "continue")
+        self.expect("results2")
+        self.timed("rerun", self.at.run)
+        return self.samples
+
+
+def _init_worker(db_dir):
+    # One SQLite file per process, so the walks' background writers don't contend for one file
+    os.environ["TRIFACTOR_DB"] = os.path.join(db_dir, f"runs-{os.getpid()}.db")
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+
+def walk(seed):
+    # One AppTest at a time per process; runs in workers
+    return Session(seed).walk()
+
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, min(len(sorted_values), round(p / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples):
+    groups = defaultdict(list)
+    for stage, action, seconds in samples:
+        groups[(stage, action)].append(seconds)
+        groups[(stage, "*")].append(seconds)
+    out = {}
+    for (stage, action), values in groups.items():
+        values.sort()
+        out[f"{stage}/{action}"] = {
+            "n": len(values),
+            "p50_ms": percentile(values, 50) * 1e3,
+            "p99_ms": percentile(values, 99) * 1e3,
+            "max_ms": values[-1] * 1e3,
+        }
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless per-rerun latency of app.py")
+    parser.add_argument("--sessions", type=int, default=20, help="simulated users (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=1, help="sessions running at once, one per process (default: 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    # Left in place: the store's writer thread lives until exit
+    db_dir = tempfile.mkdtemp(prefix="trifactor-apptest-")
+    seeds = range(args.seed, args.seed + args.sessions)
+
+    t0 = time.perf_counter()
+    if args.concurrency > 1:
+        with ProcessPoolExecutor(args.concurrency, initializer=_init_worker, initargs=(db_dir,)) as pool:
+            walks = list(pool.map(walk, seeds))
+    else:
+        _init_worker(db_dir)
+        walks = [walk(seed) for seed in seeds]
+    samples = [s for w in walks for s in w]
+    wall = time.perf_counter() - t0
+
+    summary = summarize(samples)
+    print(f"{args.sessions} sessions, concurrency {args.concurrency}, {len(samples)} script runs in {wall:.1f}s")
+    print(f"{'stage/click':<28} {'n':>6} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    order = {stage: i for i, stage in enumerate(STAGES)}
+    for name in sorted(summary, key=lambda k: (order.get(k.split("/")[0], len(order)), k.split("/")[1] != "*", k)):
+        row = summary[name]
+        print(f"{name:<28} {row['n']:>6} {row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"sessions": args.sessions, "concurrency": args.concurrency, "wall_s": wall, "stages": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
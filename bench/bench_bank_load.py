@@ -0,0 +1,37 @@
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine import compiled_bank, question_bank  # noqa: E402
+from question_bank import load_question_bank  # noqa: E402
+
+# =========================================================
+# Per-rerun cost of getting the question bank
+# - before: the bank as dict literals in the script, re-evaluated every rerun
+#   (Streamlit reuses the compiled bytecode, so we time exec of it only)
+# - after: cached, mtime-checked bank + compiled index (one stat() per call)
+# Usage: python bench/bench_bank_load.py [runs]
+# =========================================================
+
+
+def main(runs=2000):
+    literal_src = f"QUESTION_BANK = {load_question_bank()!r}\n"
+    code = compile(literal_src, "app.py", "exec")
+
+    def before():
+        exec(code, {})
+
+    def after():
+        question_bank()
+        compiled_bank("Financial")
+
+    after()  # first load happens once per process
+    for name, fn in (("before (literals per rerun)", before), ("after (cached bank)", after)):
+        best = min(timeit.repeat(fn, number=runs, repeat=5)) / runs
+        print(f"{name:<30} {best * 1e6:10.1f} us/rerun")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
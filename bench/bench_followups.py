@@ -0,0 +1,70 @@
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine import VARIABLES, CompiledBank, pick_followup_questions  # noqa: E402
+
+# =========================================================
+# Follow-up picker: legacy list scans vs compiled-bank weighted sampling
+# - synthetic banks from 75 to 100k questions, 25 already asked, 2 targets
+# Usage: python bench/bench_followups.py
+# =========================================================
+
+SIZES = (75, 300, 1_000, 10_000, 100_000)
+
+
+def synthetic_bank(size, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"q{i:06d}",
+            "text": f"Synthetic question {i}",
+            "variable": rng.choice(VARIABLES),
+            "weight": rng.choice((1.0, 1.1, 1.2, 1.3)),
+            "reverse": rng.random() < 0.5,
+        }
+        for i in range(size)
+    ]
+
+
+def legacy_pick(bank, targets, already_asked_ids, n=10):
+    # Pre-compiled-bank picker: four candidate lists with `q not in picked` scans
+    picked = [q for q in bank if (q["variable"] in targets) and (q["id"] not in already_asked_ids)]
+    random.shuffle(picked)
+    picked = picked[:n]
+    if len(picked) < n:
+        c2 = [q for q in bank if (q["id"] not in already_asked_ids) and (q not in picked)]
+        random.shuffle(c2)
+        picked.extend(c2[: (n - len(picked))])
+    if len(picked) < n:
+        c3 = [q for q in bank if (q["variable"] in targets) and (q not in picked)]
+        random.shuffle(c3)
+        picked.extend(c3[: (n - len(picked))])
+    if len(picked) < n:
+        c4 = [q for q in bank if q not in picked]
+        random.shuffle(c4)
+        picked.extend(c4[: (n - len(picked))])
+    return picked[:n]
+
+
+def main():
+    targets = ["Clarity", "Feedback"]
+    print(f"{'bank size':>10} {'legacy ms':>12} {'compiled ms':>14}")
+    for size in SIZES:
+        questions = synthetic_bank(size)
+        cb = CompiledBank("synthetic", questions)
+        asked = {q["id"] for q in random.Random(1).sample(questions, 25)}
+        runs = max(3, 20_000 // size)
+
+        legacy = min(timeit.repeat(lambda: legacy_pick(questions, targets, asked), number=runs, repeat=3)) / runs
+        single = min(
+            timeit.repeat(lambda: pick_followup_questions("synthetic", targets, asked, bank=cb), number=runs, repeat=3)
+        ) / runs
+        print(f"{size:>10} {legacy * 1e3:>12.3f} {single * 1e3:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import random
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_followups import synthetic_bank  # noqa: E402
+from engine import CompiledBank  # noqa: E402
+from run_state import RunState  # noqa: E402
+
+# =========================================================
+# Cost of starting a run ("Start 25 questions" / "New run")
+# - before: copy the lens' question list, shuffle it, sample 25 dicts
+# - after: sample 25 positions of the shared, read-only CompiledBank
+# Reports time and tracemalloc bytes/blocks still held per start (the
+# run's own state) and peak bytes allocated while starting.
+# Usage: python bench/bench_run_start.py [runs]
+# =========================================================
+
+K = 25
+
+
+def allocations(fn, runs):
+    # (bytes held, blocks held, peak transient bytes) per call, averaged over `runs`
+    keep = []
+    peaks = 0
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(runs):
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            keep.append(fn())
+            peaks += tracemalloc.get_traced_memory()[1] - start
+        stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+    finally:
+        tracemalloc.stop()
+    size = sum(s.size_diff for s in stats if s.size_diff > 0)
+    blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    return size / runs, blocks / runs, peaks / runs
+
+
+def main(runs=2000):
+    rng = random.Random(0)
+    for n in (75, 1_000, 100_000):
+        questions = synthetic_bank(n)
+        cb = CompiledBank("synthetic", questions)
+
+        def before():
+            pool = questions[:]
+            rng.shuffle(pool)
+            return rng.sample(pool, min(K, len(pool)))
+
+        def after():
+            return RunState(cb, rng.sample(range(len(cb)), min(K, len(cb))))
+
+        reps = max(10, runs // max(1, n // 1000))
+        for name, fn in (("before (copy+shuffle)", before), ("after (positions)", after)):
+            best = min(timeit.repeat(fn, number=reps, repeat=5)) / reps
+            held, blocks, peak = allocations(fn, min(reps, 200))
+            print(
+                f"bank={n:<7} {name:<22} {best * 1e6:10.1f} us/start"
+                f" {held:8.0f} B held {blocks:6.1f} blocks  peak {peak:10.0f} B"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
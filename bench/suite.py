@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from batch import UNANSWERED, score_matrix  # noqa: E402
+from bench_followups import synthetic_bank  # noqa: E402
+from engine import (  # noqa: E402
+    CompiledBank,
+    RunningScores,
+    build_readout,
+    choose_followup_targets,
+    compute_scores,
+    pick_followup_questions,
+    readout_summary,
+)
+from run_state import RunState  # noqa: E402
+
+# =========================================================
+# Benchmark suite: scoring, follow-up selection, readout data path
+# - synthetic banks from 75 to 100k questions, 1 to 1M respondents
+# - every run is appended to bench/results.jsonl, tagged with the commit,
+#   and compared against the latest run from a different commit
+# - that history is per checkout (git-ignored: timings only compare on one
+#   machine); --results / TRIFACTOR_BENCH_RESULTS point it at a shared file
+# Usage: python bench/suite.py [--quick] [-k pattern] [--no-save] [--against REV] [--results PATH]
+# =========================================================
+
+RESULTS_PATH = Path(os.environ.get("TRIFACTOR_BENCH_RESULTS", Path(__file__).with_name("results.jsonl")))
+
+BANK_SIZES = (75, 1_000, 10_000, 100_000)
+ANSWERED = (25, 35, 1_000, 100_000)  # 25 base, 25 + 10 follow-ups, then whole banks
+RESPONDENTS = (1, 1_000, 100_000, 1_000_000)
+QUICK_SKIP = {100_000, 1_000_000}
+REGRESSION = 1.10  # flag cases at least 10% slower than the baseline
+
+
+def synthetic_run(bank, k, seed=0):
+    # k answered questions from `bank` with uniform 0..4 answers
+    rng = random.Random(seed)
+    questions = rng.sample(bank, k) if k < len(bank) else list(bank)
+    return questions, {q["id"]: rng.randint(0, 4) for q in questions}
+
+
+def cases(quick=False):
+    """Yield (name, fn) pairs; fn takes no arguments and is timed as-is."""
+    sizes = [n for n in BANK_SIZES if not (quick and n in QUICK_SKIP)]
+    banks = {n: synthetic_bank(n) for n in sizes}
+
+    for k in ANSWERED:
+        if quick and k in QUICK_SKIP:
+            continue
+        questions, answers = synthetic_run(banks[min(n for n in sizes if n >= k)], k)
+        yield f"compute_scores/answered={k}", lambda q=questions, a=answers: compute_scores(q, a)
+
+    questions, answers = synthetic_run(banks[75], 25)
+    _overall, per_variable, _scored = compute_scores(questions, answers)
+    yield "choose_followup_targets", lambda: choose_followup_targets(per_variable)
+
+    targets = choose_followup_targets(per_variable)
+    for n in sizes:
+        cb = CompiledBank("synthetic", banks[n])
+        asked = {q["id"] for q in random.Random(1).sample(banks[n], 25)}
+        yield f"pick_followup_questions/bank={n}", lambda cb=cb, asked=asked: pick_followup_questions(
+            "synthetic", targets, asked, bank=cb
+        )
+
+    for n in sizes:
+        cb = CompiledBank("synthetic", banks[n])
+        yield f"run_start/bank={n}", lambda cb=cb: RunState(cb, random.sample(range(len(cb)), 25))
+
+    # Data side of app.render_readout: everything it reads comes from one readout dict
+    questions, answers = synthetic_run(banks[75], 35)
+    running = RunningScores(CompiledBank("synthetic", banks[75]))
+    for q in questions:
+        running.set(q, answers[q["id"]])
+    readout = running.readout("synthetic")
+    yield "readout/build_readout", lambda: build_readout("synthetic", questions, answers)
+    yield "readout/running", lambda: running.readout("synthetic")
+    yield "readout/set_answer", lambda q=questions[0]: running.set(q, random.randint(0, 4))
+    yield "readout/summary", lambda: readout_summary(readout)
+
+    bank75 = banks[75]
+    rng = np.random.default_rng(0)
+    for n in RESPONDENTS:
+        if quick and n in QUICK_SKIP:
+            continue
+        # 25 of 75 answered per respondent, like the app
+        answers_m = np.full((n, len(bank75)), UNANSWERED, dtype=np.int8)
+        cols = np.argsort(rng.random((n, len(bank75))), axis=1)[:, :25]
+        np.put_along_axis(answers_m, cols, rng.integers(0, 5, size=cols.shape, dtype=np.int8), axis=1)
+        yield f"score_matrix/respondents={n}", lambda m=answers_m: score_matrix(m, bank75, "synthetic")
+        del answers_m, cols
+
+
+def measure(fn, repeat=5):
+    # Best-of-`repeat` seconds per call, each repeat running for >= 0.2s
+    timer = timeit.Timer(fn)
+    number, _elapsed = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def git_commit():
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return sha, dirty
+
+
+def load_results(path=RESULTS_PATH):
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline(history, commit, against=None):
+    # Latest saved run for `against`, or else for any commit other than this one
+    for entry in reversed(history):
+        if against is not None:
+            if entry["commit"].startswith(against):
+                return entry
+        elif entry["commit"] != commit:
+            return entry
+    return None
+
+
+def fmt(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trifactor benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k-question and 1M-respondent cases")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per case (default: 5)")
+    parser.add_argument("--no-save", action="store_true", help="don't append to the results history")
+    parser.add_argument("--against", help="compare with the latest saved run of this commit")
+    parser.add_argument("--results", type=Path, default=RESULTS_PATH, help=f"results history file (default: {RESULTS_PATH})")
+    args = parser.parse_args(argv)
+
+    commit, dirty = git_commit()
+    base = baseline(load_results(args.results), commit, args.against)
+    base_results = base["results"] if base else {}
+    if base:
+        print(f"baseline: {base['commit']}{' (dirty)' if base['dirty'] else ''} at {base['timestamp']}")
+
+    results = {}
+    slower = []
+    print(f"{'case':<40} {'time':>12} {'vs base':>9}")
+    for name, fn in cases(args.quick):
+        if args.pattern and args.pattern not in name:
+            continue
+        results[name] = seconds = measure(fn, args.repeat)
+        ratio = ""
+        if name in base_results:
+            r = seconds / base_results[name]
+            ratio = f"{r:.2f}x"
+            if r >= REGRESSION:
+                slower.append(name)
+                ratio += " !"
+        print(f"{name:<40} {fmt(seconds):>12} {ratio:>9}", flush=True)
+
+    if not args.no_save and results:
+        entry = {
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    if slower:
+        print(f"{len(slower)} case(s) at least {REGRESSION:.2f}x slower than baseline: {', '.join(slower)}")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
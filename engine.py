@@ -0,0 +1,643 @@
+import heapq
+import logging
+import math
+import random
+import threading
+from array import array
+from types import MappingProxyType
+
+from metrics import FOLLOWUP_POOL_SETS, FOLLOWUP_POOLS, PICKER_SECONDS, SCORING_SECONDS, timed
+from question_bank import bank_mtime, load_question_bank
+
+log = logging.getLogger(__name__)
+
+# =========================================================
+# Trifactor scoring engine (no Streamlit)
+# - Takes a question list + answers dict (qid -> 0..4)
+# - Returns overall score, per-variable pct/zone/volatility, ranked signals
+# - Safe to import from batch jobs, APIs and the Streamlit app
+# =========================================================
+
+VARIABLE_WEIGHTS = {
+    "Baseline": 1.2,
+    "Clarity": 1.1,
+    "Resources": 1.1,
+    "Boundaries": 1.1,
+    "Execution": 1.2,
+    "Feedback": 1.0,
+}
+
+VARIABLES = tuple(VARIABLE_WEIGHTS)
+VARIABLE_CODES = MappingProxyType({v: i for i, v in enumerate(VARIABLES)})
+
+SCALE_MAX = 4
+
+
+def clamp(n, lo, hi):
+    return max(lo, min(hi, n))
+
+
+def zone_name(score_0_100: float) -> str:
+    if score_0_100 < 45:
+        return "RED"
+    if score_0_100 < 70:
+        return "YELLOW"
+    return "GREEN"
+
+
+# --------------------------
+# Compiled bank (built once per lens per process)
+# --------------------------
+class Question(dict):
+    """A bank question: a dict shared by every session and thread, so writes raise TypeError."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("bank questions are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    # Pickled by value, restored as the current bank's object when it's unchanged
+    def __reduce__(self):
+        return _restore_question, (dict(self),)
+
+
+def _restore_question(data):
+    for lens in question_bank():
+        cb = compiled_bank(lens)
+        i = cb.index.get(data.get("id"))
+        if i is not None and cb.questions[i] == data:
+            return cb.questions[i]
+    return Question(data)
+
+
+def _freeze(bank):
+    # {lens: [dict]} from JSON -> read-only {lens: (Question, ...)}
+    return MappingProxyType({lens: tuple(map(Question, questions)) for lens, questions in bank.items()})
+
+
+class CompiledBank:
+    """Read-only index over one lens' question list, shared by every session.
+
+    Parallel sequences share one position per question: ids, weights, reverse
+    flags and variable codes (index into VARIABLES); the numeric ones are
+    read-only views of packed arrays. `index` maps qid -> position and
+    `by_variable` maps variable -> tuple of positions. Runs sample positions
+    from it and never copy the question list. The only thing that grows is
+    `followup_pools`, a memo of followup_pools() that goes away with the bank.
+    """
+
+    __slots__ = (
+        "lens",
+        "questions",
+        "ids",
+        "weights",
+        "max_weight",
+        "reverse",
+        "var_codes",
+        "index",
+        "by_variable",
+        "followup_pools",
+    )
+
+    def __init__(self, lens, questions):
+        codes = {v: i for i, v in enumerate(VARIABLES)}
+        self.lens = lens
+        self.questions = tuple(questions)
+        self.ids = tuple(q["id"] for q in self.questions)
+        self.weights = memoryview(array("d", (q.get("weight", 1.0) for q in self.questions))).toreadonly()
+        self.max_weight = max(self.weights, default=1.0)
+        self.reverse = memoryview(array("b", (bool(q.get("reverse")) for q in self.questions))).toreadonly()
+        self.var_codes = memoryview(array("b", (codes[q["variable"]] for q in self.questions))).toreadonly()
+        self.index = MappingProxyType({qid: i for i, qid in enumerate(self.ids)})
+        by_variable = {v: [] for v in VARIABLES}
+        for i, c in enumerate(self.var_codes):
+            by_variable[VARIABLES[c]].append(i)
+        self.by_variable = MappingProxyType({v: tuple(ix) for v, ix in by_variable.items()})
+        self.followup_pools = {}  # frozenset(targets) -> (in-target positions, other positions)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def question(self, qid):
+        return self.questions[self.index[qid]]
+
+    def positions(self, qids):
+        index = self.index
+        return {index[qid] for qid in qids if qid in index}
+
+    def positions_of(self, qids):
+        # [position] of every qid, in order, for restoring a pickled run; raises
+        # ValueError for a question this bank no longer has
+        index = self.index
+        try:
+            return [index[qid] for qid in qids]
+        except KeyError as e:
+            raise ValueError(f"question {e.args[0]!r} is no longer in the {self.lens!r} bank") from None
+
+
+# (mtime_ns, read-only {lens: (Question, ...)}, {lens: CompiledBank}) of the last good
+# load — swapped as one tuple
+_bank_state = (None, {}, {})
+_bank_lock = threading.Lock()
+_bank_failed = None  # mtime (None: file missing) of the last failed load; not retried until it changes
+_BANK_ERRORS = (OSError, ValueError, KeyError, TypeError, AttributeError)
+
+
+def _load_bank():
+    # Load and compile every lens, so a bank that can't be served never replaces one that can
+    bank = _freeze(load_question_bank())
+    return bank, {lens: CompiledBank(lens, questions) for lens, questions in bank.items()}
+
+
+def question_bank():
+    """Current read-only {lens: (Question, ...)}; reloaded only when the bank file's mtime changes.
+
+    Module state is shared by every session/thread of the server process, so this
+    is loaded once per process, not once per rerun. Nothing in it can be
+    mutated, so no reader needs a lock or a copy. A file that is missing, half
+    written or doesn't compile is logged and the last good bank stays in service
+    (the first load has nothing to fall back on, so it raises).
+    """
+    global _bank_state, _bank_failed
+    try:
+        mtime = bank_mtime()
+    except OSError:
+        mtime = None
+    if _bank_state[0] != mtime and (_bank_state[0] is None or mtime != _bank_failed):
+        with _bank_lock:
+            if _bank_state[0] != mtime and (_bank_state[0] is None or mtime != _bank_failed):
+                try:
+                    bank, compiled = _load_bank()
+                except _BANK_ERRORS:
+                    if _bank_state[0] is None:
+                        raise
+                    _bank_failed = mtime
+                    log.exception("question bank: reload failed, still serving the bank loaded at mtime %s", _bank_state[0])
+                else:
+                    _bank_state = (mtime, bank, compiled)
+                    _bank_failed = None
+                    for lens, cb in compiled.items():
+                        FOLLOWUP_POOL_SETS.set(len(cb.followup_pools), lens)
+    return _bank_state[1]
+
+
+def bank_version():
+    # mtime of the bank in service (not of the file, which may be mid-save)
+    question_bank()
+    return _bank_state[0]
+
+
+def compiled_bank(lens):
+    question_bank()
+    _mtime, bank, compiled = _bank_state
+    cb = compiled.get(lens)
+    if cb is None:
+        # A lens the bank doesn't have: an empty bank. Racing threads may both
+        # build one; setdefault keeps the first for everyone
+        cb = compiled.setdefault(lens, CompiledBank(lens, bank.get(lens, ())))
+        FOLLOWUP_POOL_SETS.set(len(cb.followup_pools), lens)
+    return cb
+
+
+# --------------------------
+# Scoring
+# --------------------------
+def signal(q, answer) -> int:
+    # 0..4 where higher is always healthier (reverse items are flipped)
+    a = clamp(int(answer), 0, SCALE_MAX)
+    return SCALE_MAX - a if q.get("reverse") else a
+
+
+@timed(SCORING_SECONDS, "compute_scores")
+def compute_scores(questions, answers):
+    """Score one run.
+
+    Returns (overall, per_variable, scored_sorted):
+    - overall: 0-100, VARIABLE_WEIGHTS-weighted mean of the variable pcts
+    - per_variable: {var: {"pct", "zone", "volatility", "n"}} in VARIABLES order
+    - scored_sorted: [(variable, signal, weight, question, answer)], weakest
+      first; equal items keep their order in `questions` (pass bank order)
+    """
+    scored = []
+    seen = set()
+    for q in questions:
+        qid = q["id"]
+        if qid in seen or qid not in answers:
+            continue
+        seen.add(qid)
+        a = answers[qid]
+        scored.append((q["variable"], signal(q, a), q.get("weight", 1.0), q, a))
+
+    by_var = {}
+    for t in scored:
+        by_var.setdefault(t[0], []).append(t)
+
+    # VARIABLES order, not answer order: ties and float sums must not depend on it
+    per_variable = {}
+    for v in sorted(by_var, key=lambda v: VARIABLE_CODES.get(v, len(VARIABLES))):
+        items = by_var[v]
+        n = len(items)
+        total = sum(s for _v, s, _w, _q, _a in items)
+        sumsq = sum(s * s for _v, s, _w, _q, _a in items)
+        per_variable[v] = variable_score(
+            sum(s * w for _v, s, w, _q, _a in items),
+            sum(w for _v, _s, w, _q, _a in items),
+            n,
+            (n * sumsq - total * total) / n,  # exact: signals are ints
+        )
+
+    scored_sorted = sorted(scored, key=lambda t: (t[1], -t[2]))
+    return overall_score(per_variable), per_variable, scored_sorted
+
+
+def overall_score(per_variable):
+    total_w = sum(VARIABLE_WEIGHTS.get(v, 1.0) for v in per_variable)
+    if not total_w:
+        return 0.0
+    return sum(info["pct"] * VARIABLE_WEIGHTS.get(v, 1.0) for v, info in per_variable.items()) / total_w
+
+
+def variable_score(wscore, wsum, count, m2):
+    pct = 100.0 * wscore / (wsum * SCALE_MAX) if wsum else 0.0
+    # Signals are integers, so a true M2 is 0 or >= 1/count; anything tinier is
+    # float drift from running updates. pstdev on 0..4 tops out at 2 -> map to 0..100
+    m2 = m2 if m2 > 1e-9 else 0.0
+    volatility = (m2 / count) ** 0.5 * 100.0 / (SCALE_MAX / 2) if count >= 2 else 0.0
+    # Round off running-sum drift so ties and zone edges match a fresh rescore
+    pct = round(pct, 9)
+    return {"pct": pct, "zone": zone_name(pct), "volatility": round(volatility, 9), "n": count}
+
+
+# --------------------------
+# Follow-ups
+# --------------------------
+def rank_variables(per_variable):
+    # Weakest first; ties go to the more heavily weighted variable, then VARIABLES order.
+    # The readout's ranking/lowest and the follow-up targets share this order.
+    return sorted(
+        per_variable,
+        key=lambda v: (per_variable[v]["pct"], -VARIABLE_WEIGHTS.get(v, 1.0), VARIABLE_CODES.get(v, len(VARIABLES))),
+    )
+
+
+def choose_followup_targets(per_variable, k=2, max_targets=3):
+    # Lowest k variables, plus any other RED variable (capped at max_targets)
+    ranked = rank_variables(per_variable)
+    targets = ranked[:k]
+    for v in ranked[k:]:
+        if len(targets) >= max_targets:
+            break
+        if per_variable[v]["zone"] == "RED":
+            targets.append(v)
+    return targets
+
+
+# --------------------------
+# Base sample
+# --------------------------
+def variable_quotas(cb, k):
+    """{variable: count} summing to min(k, len(cb)), in proportion to VARIABLE_WEIGHTS.
+
+    Largest-remainder rounding; a variable never gets more than it has
+    questions, and what it can't take is shared out over the rest.
+    """
+    sizes = {v: len(cb.by_variable[v]) for v in VARIABLES if cb.by_variable[v]}
+    quotas = dict.fromkeys(sizes, 0)
+    left = min(k, len(cb))
+    while left:
+        room = [v for v in sizes if quotas[v] < sizes[v]]
+        total_w = sum(VARIABLE_WEIGHTS.get(v, 1.0) for v in room)
+        shares = {v: left * VARIABLE_WEIGHTS.get(v, 1.0) / total_w for v in room}
+        for v in room:
+            got = min(int(shares[v]), sizes[v] - quotas[v])
+            quotas[v] += got
+            left -= got
+        for v in sorted(room, key=lambda v: int(shares[v]) - shares[v]):
+            if left and quotas[v] < sizes[v]:
+                quotas[v] += 1
+                left -= 1
+    return quotas
+
+
+def stratified_positions(cb, k, rng=random):
+    """k positions of `cb` meeting variable_quotas, in random order; O(k) past the quotas."""
+    out = []
+    for v, n in variable_quotas(cb, k).items():
+        group = cb.by_variable[v]
+        out.extend(group[i] for i in rng.sample(range(len(group)), n))
+    rng.shuffle(out)
+    return out
+
+
+def followup_pools(cb, targets):
+    """(in-target positions, other positions) of `cb` for a target set, in VARIABLES order.
+
+    Built once per bank and target set: there are at most 2**len(VARIABLES)
+    sets, and a bank reload starts a new CompiledBank with no pools.
+    """
+    key = frozenset(targets)
+    pools = cb.followup_pools.get(key)
+    if pools is not None:
+        FOLLOWUP_POOLS.inc("hit")
+        return pools
+    FOLLOWUP_POOLS.inc("miss")
+    typecode = "H" if len(cb) <= 0xFFFF else "I"
+    pools = (
+        array(typecode, (i for v in VARIABLES if v in key for i in cb.by_variable[v])),
+        array(typecode, (i for v in VARIABLES if v not in key for i in cb.by_variable[v])),
+    )
+    pools = cb.followup_pools.setdefault(key, pools)
+    FOLLOWUP_POOL_SETS.set(len(cb.followup_pools), cb.lens)
+    return pools
+
+
+def _sample_positions(pool, eligible, k, weights, max_weight, rng):
+    # Weighted sample without replacement of up to k eligible positions from `pool`
+    out = []
+    chosen = set()
+    total = len(pool)
+    if total > 4 * k:
+        # Big pool: uniform proposals accepted with p = w / max_weight draw each pick
+        # proportional to weight among what's left — O(k) expected, no full scan
+        for _ in range(8 * k + 16):
+            i = pool[rng.randrange(total)]
+            if i not in chosen and eligible(i) and rng.random() * max_weight < weights[i]:
+                out.append(i)
+                chosen.add(i)
+                if len(out) == k:
+                    return out
+    # Small or mostly ineligible pool: Exp(weight) keys, smallest k win.
+    # Weight <= 0 sorts last (in pool order): only picked once nothing else is left
+    def key(i):
+        w = weights[i]
+        return rng.expovariate(w) if w > 0 else math.inf
+
+    candidates = [i for i in pool if i not in chosen and eligible(i)]
+    out.extend(heapq.nsmallest(k - len(out), candidates, key=key))
+    return out
+
+
+@timed(PICKER_SECONDS)
+def pick_followup_positions(cb, targets, asked=(), n=10, rng=random):
+    """Pick n follow-up positions from compiled bank `cb`.
+
+    Tiers (filled in order): unasked in targets, unasked anywhere, repeats in
+    targets, anything. Within a tier it is weighted sampling without
+    replacement by question weight (weight 0 questions come last); a tier is
+    only touched if the ones before it ran out. `asked` is a set of positions
+    already shown.
+    """
+    in_targets, others = followup_pools(cb, targets)
+
+    picked = []
+    taken = set()
+
+    def unasked(i):
+        return i not in asked and i not in taken
+
+    def repeat(i):
+        return i in asked and i not in taken
+
+    for pool, eligible in ((in_targets, unasked), (others, unasked), (in_targets, repeat), (others, repeat)):
+        need = n - len(picked)
+        if need <= 0:
+            break
+        got = _sample_positions(pool, eligible, need, cb.weights, cb.max_weight, rng)
+        picked.extend(got)
+        taken.update(got)
+    return picked
+
+
+def pick_followup_questions(lens, targets, already_asked_ids=(), n=10, rng=random, bank=None):
+    # Question-dict form of pick_followup_positions, for callers holding ids
+    cb = compiled_bank(lens) if bank is None else bank
+    return [cb.questions[i] for i in pick_followup_positions(cb, targets, cb.positions(already_asked_ids), n, rng)]
+
+
+# --------------------------
+# Readout (data only — rendering lives in app.py)
+# --------------------------
+def _readout(lens, overall, per_variable, signals, weakest, strongest):
+    # weakest/strongest: {var: item}; signals: weakest-first item list
+    ranking = rank_variables(per_variable)
+    lowest = ranking[0] if ranking else None
+    highest = ranking[-1] if ranking else None
+
+    # Per variable: (strongest, weakest) item when they disagree by >= 2 points
+    spread = {
+        v: (strongest[v], weakest[v])
+        for v in per_variable
+        if per_variable[v]["n"] >= 2 and strongest[v][1] - weakest[v][1] >= 2
+    }
+
+    return {
+        "lens": lens,
+        "overall": overall,
+        "per_variable": per_variable,
+        "signals": signals,
+        "ranking": ranking,
+        "lowest": lowest,
+        "highest": highest,
+        "lever": weakest[lowest] if lowest is not None else None,
+        "spread": spread,
+        "targets": choose_followup_targets(per_variable),
+    }
+
+
+def build_readout(lens, questions, answers):
+    overall, per_variable, scored_sorted = compute_scores(questions, answers)
+
+    # scored_sorted is weakest-first, so the first item seen per variable is its weakest
+    weakest, strongest = {}, {}
+    for t in scored_sorted:
+        weakest.setdefault(t[0], t)
+        if t[0] not in strongest or t[1] > strongest[t[0]][1]:
+            strongest[t[0]] = t
+
+    return _readout(lens, overall, per_variable, scored_sorted, weakest, strongest)
+
+
+# --------------------------
+# Running aggregates (one run, updated per answer)
+# --------------------------
+class RunningScores:
+    """Per-variable running aggregates for one run, updated one answer at a time.
+
+    Pinned to the run's CompiledBank and stored as {position: answer}, plus
+    per-variable weighted sums and a Welford mean/M2 of signals in one flat
+    array. set()/remove() touch only one variable, so per_variable() is
+    O(variables); readout() scans the answers once for the weakest/strongest
+    items, O(answers). The latest answer to a question wins, like merged
+    answers do. Nothing depends on answer order: ties go by VARIABLES order,
+    then bank position, so a readout is a function of the answer set.
+    """
+
+    __slots__ = ("bank", "_answers", "_stats", "_vector")
+
+    _WIDTH = 5  # count, mean, m2, wsum, wscore per variable code
+
+    def __init__(self, bank):
+        self.bank = bank
+        self._answers = {}  # position -> 0..4
+        self._stats = array("d", bytes(8 * self._WIDTH * len(VARIABLES)))
+        self._vector = None  # memoized answer_vector()
+
+    # Pickled as question ids + answers and restored by id against the lens' current
+    # bank, like RunState: an edited or reordered bank can't move an answer to another question
+    def __reduce__(self):
+        ids = self.bank.ids
+        return _restore_running, (self.bank.lens, tuple(ids[p] for p in self._answers), bytes(self._answers.values()))
+
+    def __len__(self):
+        return len(self._answers)
+
+    def __contains__(self, qid):
+        return self.bank.index.get(qid) in self._answers
+
+    def answers(self):
+        ids = self.bank.ids
+        return {ids[p]: a for p, a in self._answers.items()}
+
+    def answer_vector(self):
+        # (sorted qids, answers in that order): the canonical key of this answer set
+        if self._vector is None:
+            ids = self.bank.ids
+            pairs = sorted((ids[p], a) for p, a in self._answers.items())
+            self._vector = (tuple(qid for qid, _a in pairs), tuple(a for _qid, a in pairs))
+        return self._vector
+
+    def set(self, q, answer):
+        self.set_position(self.bank.index[q["id"]], answer)
+
+    def set_position(self, p, answer):
+        answer = clamp(int(answer), 0, SCALE_MAX)
+        prev = self._answers.get(p)
+        if prev == answer:
+            return
+        if prev is not None:
+            self._update(p, prev, -1)
+        self._answers[p] = answer
+        self._update(p, answer, 1)
+
+    def remove(self, qid):
+        p = self.bank.index.get(qid)
+        prev = self._answers.pop(p, None)
+        if prev is None:
+            return
+        self._update(p, prev, -1)
+
+    def _signal(self, p, answer):
+        return SCALE_MAX - answer if self.bank.reverse[p] else answer
+
+    def _update(self, p, answer, sign):
+        # Add (sign=1) or drop (sign=-1) one answer from its variable's aggregates
+        self._vector = None
+        c = self.bank.var_codes[p]
+        s = self._signal(p, answer)
+        w = self.bank.weights[p]
+        st = self._stats
+        o = c * self._WIDTH
+        if sign > 0:
+            st[o] += 1
+            d = s - st[o + 1]
+            st[o + 1] += d / st[o]
+            st[o + 2] += d * (s - st[o + 1])
+            st[o + 3] += w
+            st[o + 4] += s * w
+            return
+        n = st[o] - 1
+        if n == 0:
+            st[o : o + self._WIDTH] = array("d", bytes(8 * self._WIDTH))
+            return
+        mean = (st[o] * st[o + 1] - s) / n
+        st[o + 2] -= (s - mean) * (s - st[o + 1])
+        st[o], st[o + 1] = n, mean
+        st[o + 3] -= w
+        st[o + 4] -= s * w
+
+    def _variables(self):
+        # (variable, count, m2, wsum, wscore) for answered variables, in VARIABLES order
+        st = self._stats
+        for c in range(len(VARIABLES)):
+            o = c * self._WIDTH
+            if st[o]:
+                yield VARIABLES[c], int(st[o]), st[o + 2], st[o + 3], st[o + 4]
+
+    def per_variable(self):
+        return {v: variable_score(wscore, wsum, count, m2) for v, count, m2, wsum, wscore in self._variables()}
+
+    def signal_stats(self):
+        # {variable: (count, weighted mean signal, M2)} for variables with answers
+        return {v: (count, wscore / wsum, m2) for v, count, m2, wsum, wscore in self._variables() if wsum}
+
+    @timed(SCORING_SECONDS, "running_readout")
+    def readout(self, lens, top=5):
+        # Same dict as build_readout over the answers' questions in bank order; "signals" holds only the `top` weakest items
+        per_variable = self.per_variable()
+        bank = self.bank
+        questions, weights, codes = bank.questions, bank.weights, bank.var_codes
+
+        ranked = [(self._signal(p, a), -weights[p], p, a) for p, a in self._answers.items()]
+
+        def item(r):
+            return (VARIABLES[codes[r[2]]], r[0], weights[r[2]], questions[r[2]], r[3])
+
+        weakest, strongest = {}, {}
+        for r in ranked:
+            v = VARIABLES[codes[r[2]]]
+            if v not in weakest or r < weakest[v]:
+                weakest[v] = r
+            if v not in strongest or (-r[0], r[1], r[2]) < (-strongest[v][0], strongest[v][1], strongest[v][2]):
+                strongest[v] = r
+
+        signals = [item(r) for r in heapq.nsmallest(top, ranked)]
+        weakest = {v: item(r) for v, r in weakest.items()}
+        strongest = {v: item(r) for v, r in strongest.items()}
+        return _readout(lens, overall_score(per_variable), per_variable, signals, weakest, strongest)
+
+
+def _restore_running(lens, qids, answers):
+    running = RunningScores(compiled_bank(lens))
+    for p, a in zip(running.bank.positions_of(qids), answers):
+        running.set_position(p, a)
+    return running
+
+
+def export_record(readout, phase, answers, seed=None):
+    # seed: the run's run_seed; with lens and phase (and, adaptive, the answers) it replays the run
+    per_variable = readout["per_variable"]
+    return {
+        "lens": readout["lens"],
+        "phase": phase,
+        "seed": seed,
+        "overall": round(readout["overall"], 2),
+        "variables": {v: round(per_variable[v]["pct"], 2) for v in per_variable},
+        "answers": answers,
+        "targets": readout["targets"],
+    }
+
+
+def readout_summary(readout, top=5):
+    # JSON-ready readout (no question dicts) for batch jobs and APIs
+    return {
+        "lens": readout["lens"],
+        "overall": round(readout["overall"], 2),
+        "variables": {
+            v: {
+                "pct": round(info["pct"], 2),
+                "zone": info["zone"],
+                "volatility": round(info["volatility"], 2),
+                "n": info["n"],
+            }
+            for v, info in readout["per_variable"].items()
+        },
+        "lowest": readout["lowest"],
+        "highest": readout["highest"],
+        "targets": readout["targets"],
+        "signals": [
+            {"id": q["id"], "variable": v, "signal": s, "weight": w, "answer": a}
+            for v, s, w, q, a in readout["signals"][:top]
+        ],
+    }
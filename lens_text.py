@@ -0,0 +1,213 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
+# =========================================================
+# Lens text (no Streamlit)
+# - zone and variable wording per lens, shared by every stage
+# - compiled once per process into flat read-only dicts keyed by
+#   lens / (lens, variable), so every lookup is one hash hit
+# - translated deployments: TRIFACTOR_LOCALE=de reads locales/de.json
+#   (or TRIFACTOR_LOCALE_DIR/de.json) on first use. It has the same shape as
+#   TEXT below, and any key it leaves out falls back to English. Locales that
+#   aren't used are never read. A locale file that is missing or doesn't
+#   parse is logged once and served as English.
+# =========================================================
+
+log = logging.getLogger(__name__)
+
+LOCALE = os.environ.get("TRIFACTOR_LOCALE") or None
+LOCALE_DIR = Path(os.environ.get("TRIFACTOR_LOCALE_DIR", Path(__file__).with_name("locales")))
+
+TEXT = {
+    "zone_message": {
+        "RED": "broken — needs urgent attention",
+        "YELLOW": "unstable — fragile under pressure",
+        "GREEN": "solid — working well",
+    },
+    "compassionate_zone": {
+        "RED": "needs support now (signal, not failure)",
+        "YELLOW": "workable, but inconsistent under stress",
+        "GREEN": "stable and helping you",
+    },
+    "lens_focus": {
+        "Interpersonal": "relationship tension, clarity, boundaries, execution",
+        "Financial": "money stability, buffer, boundaries, execution",
+        "Big Picture": "mission clarity, resources, focus, execution, feedback",
+    },
+    # "*" is the fallback for lenses without their own entry
+    "lens_intro": {
+        "Interpersonal": "Interpreting through **relationship dynamics**: tension, clarity, boundaries, follow-through.",
+        "Financial": "Interpreting through **money stability + control**: clarity, buffer, boundaries, execution.",
+        "*": "Interpreting through **mission control**: clarity, focus, resources, execution, feedback loops.",
+    },
+    "variable": {
+        "Interpersonal": {
+            "Baseline": "Emotional stability under contact",
+            "Clarity": "Knowing what you want / what's true",
+            "Resources": "Support & emotional capacity",
+            "Boundaries": "Ability to hold limits",
+            "Execution": "Following through on difficult conversations",
+            "Feedback": "Repair & learning from conflict",
+        },
+        "Financial": {
+            "Baseline": "Stability under financial stress",
+            "Clarity": "Knowing your numbers & priorities",
+            "Resources": "Income, buffer, tools",
+            "Boundaries": "Control over spending & exposure",
+            "Execution": "Actually doing the necessary actions",
+            "Feedback": "Reviewing & closing leaks",
+        },
+        "Big Picture": {
+            "Baseline": "Overall momentum & stability",
+            "Clarity": "Clear direction & next step",
+            "Resources": "Energy, support, environment",
+            "Boundaries": "Protecting focus & saying no",
+            "Execution": "Shipping & completing work",
+            "Feedback": "Measuring & iterating",
+        },
+    },
+    "lens_label": {
+        "Interpersonal": {
+            "Baseline": "Emotional baseline under contact",
+            "Clarity": "What you want / what’s true",
+            "Resources": "Support + emotional bandwidth",
+            "Boundaries": "Limits + self-respect in action",
+            "Execution": "Having the talk / doing the thing",
+            "Feedback": "Repair, learning, reality-checking",
+        },
+        "Financial": {
+            "Baseline": "Stability under money stress",
+            "Clarity": "Knowing your numbers + priorities",
+            "Resources": "Income, buffer, tools",
+            "Boundaries": "Control over spending + exposure",
+            "Execution": "Doing the necessary money actions",
+            "Feedback": "Reviewing + closing leaks",
+        },
+        "Big Picture": {
+            "Baseline": "Momentum + overall stability",
+            "Clarity": "Direction + next step",
+            "Resources": "Energy, support, environment",
+            "Boundaries": "Protecting focus + saying no",
+            "Execution": "Shipping + finishing work",
+            "Feedback": "Measuring + iterating",
+        },
+    },
+    # Templates: {var} is the weakest variable, {label} its lens label
+    "pressure_summary": {
+        "Interpersonal": "Biggest pressure is in **{var}** — likely too much emotional load or poor resolution patterns.",
+        "Financial": "Biggest pressure is in **{var}** — usually buffer, system, or leak problem.",
+        "Big Picture": "Biggest pressure is in **{var}** — goal is real, but structure/support isn't matching.",
+        "*": "Pressure concentrates in **{var}**.",
+    },
+    "compassionate_summary": {
+        "Interpersonal": "Most of the strain is landing on **{label}**. That’s where contact is costing you more than it gives back.",
+        "Financial": "Most of the strain is landing on **{label}**. Steady that first and the rest of the money picture gets easier to hold.",
+        "*": "Most of the strain is landing on **{label}**. The direction can be right while this part quietly drains it.",
+    },
+}
+
+
+class Catalog:
+    """One locale's text, flattened: {key: str} or {(lens, variable): str}, all read-only."""
+
+    __slots__ = (
+        "locale",
+        "zone_message",
+        "compassionate_zone",
+        "lens_focus",
+        "lens_intro",
+        "variable",
+        "lens_label",
+        "pressure_summary",
+        "compassionate_summary",
+    )
+
+    def __init__(self, locale, text):
+        self.locale = locale
+        for name in ("zone_message", "compassionate_zone", "lens_focus", "lens_intro", "pressure_summary", "compassionate_summary"):
+            setattr(self, name, MappingProxyType(dict(text[name])))
+        for name in ("variable", "lens_label"):
+            flat = {(lens, v): s for lens, per_var in text[name].items() for v, s in per_var.items()}
+            setattr(self, name, MappingProxyType(flat))
+
+
+def _overlay(base, override):
+    # Locale entries replace English ones key by key, one nesting level deep
+    out = {}
+    for name, section in base.items():
+        section = dict(section)
+        for key, value in override.get(name, {}).items():
+            section[key] = {**section.get(key, {}), **value} if isinstance(value, dict) else value
+        out[name] = section
+    return out
+
+
+_catalogs = {None: Catalog(None, TEXT)}
+_catalog_lock = threading.Lock()
+
+
+def catalog(locale=None):
+    """Catalog for `locale` (default: TRIFACTOR_LOCALE, else English); a locale file is read once, on first use."""
+    if locale is None:
+        locale = LOCALE
+    c = _catalogs.get(locale)
+    if c is None:
+        with _catalog_lock:
+            c = _catalogs.get(locale)
+            if c is None:
+                try:
+                    with open(LOCALE_DIR / f"{locale}.json", encoding="utf-8") as f:
+                        c = Catalog(locale, _overlay(TEXT, json.load(f)))
+                except (OSError, ValueError, AttributeError, TypeError) as e:
+                    # Cached like a good locale, so the file isn't retried on every lookup
+                    log.warning("lens text: locale %r unavailable, using English: %s", locale, e)
+                    c = _catalogs[None]
+                _catalogs[locale] = c
+    return c
+
+
+# The configured locale is checked at startup, not on the first readout
+if LOCALE:
+    catalog(LOCALE)
+
+
+# --------------------------
+# Lookups
+# --------------------------
+def zone_message(zone: str, locale=None) -> str:
+    return catalog(locale).zone_message[zone]
+
+
+def lens_focus(lens: str, locale=None) -> str:
+    return catalog(locale).lens_focus[lens]
+
+
+def variable_translation(lens: str, var: str, locale=None) -> str:
+    return catalog(locale).variable.get((lens, var), var)
+
+
+def pressure_focus_summary(lens: str, weakest_var: str, locale=None) -> str:
+    summaries = catalog(locale).pressure_summary
+    return summaries.get(lens, summaries["*"]).format(var=weakest_var)
+
+
+def compassionate_zone_line(zone: str, locale=None) -> str:
+    return catalog(locale).compassionate_zone.get(zone, zone)
+
+
+def lens_readout_intro(lens: str, locale=None) -> str:
+    intros = catalog(locale).lens_intro
+    return intros.get(lens, intros["*"])
+
+
+def lens_translation(lens: str, variable: str, locale=None) -> str:
+    return catalog(locale).lens_label.get((lens, variable), variable)
+
+
+def compassionate_summary(lens: str, low_label: str, locale=None) -> str:
+    summaries = catalog(locale).compassionate_summary
+    return summaries.get(lens, summaries["*"]).format(label=low_label)
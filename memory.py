@@ -0,0 +1,131 @@
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+import weakref
+from collections import deque
+from types import FunctionType, ModuleType
+
+from engine import CompiledBank, question_bank
+
+# =========================================================
+# Session memory accounting (no Streamlit)
+#   TRIFACTOR_MEMORY_DEBUG=1   per-key session sizes: sidebar panel + a log
+#                              line on every stage transition
+#   TRIFACTOR_TRACEMALLOC=10   also trace allocations (10 frames per site)
+#                              for process totals and top allocation sites
+# - sizes are approximate deep sizes (sys.getsizeof over the object graph);
+#   the shared question bank is never charged to a session
+# =========================================================
+
+log = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("TRIFACTOR_MEMORY_DEBUG", "") not in ("", "0")
+TRACE_FRAMES = int(os.environ.get("TRIFACTOR_TRACEMALLOC", "0") or 0)
+
+if ENABLED and not log.handlers:
+    # Streamlit leaves the root logger alone, so INFO lines would go nowhere
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(name)s: %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
+# Never descend into these: shared by every session, or not data
+_OPAQUE = (CompiledBank, ModuleType, FunctionType, type, threading.Thread)
+
+
+def _shared_ids():
+    # The current bank's lists and question dicts (readouts point at them)
+    ids = set()
+    for questions in question_bank().values():
+        ids.add(id(questions))
+        ids.update(id(q) for q in questions)
+    return ids
+
+
+def deep_size(obj, skip=frozenset()):
+    """Approximate bytes reachable from obj, each object counted once."""
+    seen = set(skip)
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _OPAQUE):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        else:
+            for name in getattr(type(o), "__slots__", ()):
+                stack.append(getattr(o, name, None))
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+    return total
+
+
+def session_sizes(state):
+    # {key: approx bytes} for a mapping of session state, largest first
+    skip = _shared_ids()
+    sizes = {key: deep_size(value, skip) for key, value in state.items()}
+    return dict(sorted(sizes.items(), key=lambda kv: kv[1], reverse=True))
+
+
+class SessionMeter:
+    """Lives in a session's state; the registry drops it when the session is garbage collected."""
+
+    __slots__ = ("session_id", "stage", "sizes", "__weakref__")
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.stage = None
+        self.sizes = {}
+
+    @property
+    def total(self):
+        return sum(self.sizes.values())
+
+    def measure(self, state, stage):
+        # Re-measure the session; logs a line when the stage changed since the last call
+        self.sizes = session_sizes(state)
+        if stage != self.stage:
+            top = ", ".join(f"{k}={v}" for k, v in list(self.sizes.items())[:5])
+            log.info(
+                "session %s %s -> %s: %d bytes (%s)", self.session_id[:8], self.stage, stage, self.total, top
+            )
+            self.stage = stage
+
+
+_meters = weakref.WeakValueDictionary()  # session_id -> SessionMeter
+
+
+def meter(session_id):
+    m = _meters.get(session_id)
+    if m is None:
+        m = _meters[session_id] = SessionMeter(session_id)
+    return m
+
+
+def live_sessions():
+    # (session count, summed last-measured bytes) across live sessions in this process
+    meters = list(_meters.values())
+    return len(meters), sum(m.total for m in meters)
+
+
+def start_tracing():
+    if TRACE_FRAMES and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+
+
+def traced(top=5):
+    """(current bytes, peak bytes, [(site, bytes)]) from tracemalloc, or None when not tracing."""
+    if not tracemalloc.is_tracing():
+        return None
+    current, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+    return current, peak, [(str(s.traceback[0]), s.size) for s in stats]
@@ -0,0 +1,220 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =========================================================
+# Hot-path metrics, Prometheus text format (no Streamlit)
+# - counters and fixed-bucket histograms, one series per label tuple
+# - no locks on the hot path: every update is a single list-item +=,
+#   which CPython doesn't interleave between threads; a scrape may see
+#   a histogram mid-update, which Prometheus tolerates
+# - export is opt-in:
+#     TRIFACTOR_METRICS_PORT=9108            -> http://host:9108/metrics
+#     TRIFACTOR_METRICS_FILE=/path/trifactor.prom  (rewritten every 15s,
+#     for node_exporter's textfile collector or any local scraper)
+# =========================================================
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+FILE_INTERVAL = 15.0
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series = {}  # label values -> [value]
+
+    def inc(self, *label_values, amount=1):
+        s = self._series.get(label_values)
+        if s is None:
+            s = self._series.setdefault(label_values, [0])
+        s[0] += amount
+
+    def samples(self):
+        for label_values, s in list(self._series.items()):
+            yield self.name, label_values, (), s[0]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, *label_values):
+        self._series[label_values] = [value]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.bounds = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *label_values):
+        s = self._series.get(label_values)
+        if s is None:
+            s = self._series.setdefault(label_values, [0] * (len(self.bounds) + 1) + [0.0])
+        s[bisect_left(self.bounds, value)] += 1
+        s[-1] += value
+
+    def samples(self):
+        for label_values, s in list(self._series.items()):
+            s = list(s)
+            total = 0
+            for bound, n in zip(self.bounds + (float("inf"),), s):
+                total += n
+                yield f"{self.name}_bucket", label_values, (("le", _le(bound)),), total
+            yield f"{self.name}_sum", label_values, (), s[-1]
+            yield f"{self.name}_count", label_values, (), total
+
+
+def _le(bound):
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def timed(histogram, *label_values):
+    # Decorator: observe each call's wall time in `histogram`
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - t0, *label_values)
+
+        return inner
+
+    return wrap
+
+
+# --------------------------
+# Registry
+# --------------------------
+STAGE_SECONDS = Histogram(
+    "trifactor_stage_run_seconds",
+    "Script runs (scope=script) and fragment reruns (scope=fragment) by stage",
+    ("stage", "scope"),
+)
+SESSIONS = Counter("trifactor_sessions_total", "Browser sessions started")
+RERUNS_PER_RUN = Histogram(
+    "trifactor_reruns_per_run",
+    "Script and fragment runs a session used from starting a run to its first readout",
+    buckets=(10, 25, 50, 75, 100, 150, 200, 300, 500),
+)
+SCORING_SECONDS = Histogram("trifactor_scoring_seconds", "Scoring and readout time by function", ("fn",))
+PICKER_SECONDS = Histogram("trifactor_followup_pick_seconds", "Follow-up picker time (pick_followup_positions)")
+
+FOLLOWUP_POOLS = Counter(
+    "trifactor_followup_pool_total", "Follow-up candidate pool lookups by result (hit/miss)", ("result",)
+)
+FOLLOWUP_POOL_SETS = Gauge(
+    "trifactor_followup_pool_sets", "Target sets with a built follow-up candidate pool, per lens' current bank", ("lens",)
+)
+FOLLOWUP_PREFETCH = Counter(
+    "trifactor_followup_prefetch_total",
+    "Follow-up rounds started by prefetch state: ready, waited (still running) or miss (picked on the click)",
+    ("result",),
+)
+READOUT_CACHE = Counter("trifactor_readout_cache_total", "Readout cache lookups by result (hit/miss)", ("result",))
+
+REGISTRY = [
+    STAGE_SECONDS,
+    SESSIONS,
+    RERUNS_PER_RUN,
+    SCORING_SECONDS,
+    PICKER_SECONDS,
+    FOLLOWUP_POOLS,
+    FOLLOWUP_POOL_SETS,
+    FOLLOWUP_PREFETCH,
+    READOUT_CACHE,
+]
+
+
+def render(registry=REGISTRY):
+    lines = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, label_values, extra, value in metric.samples():
+            pairs = list(zip(metric.labels, label_values)) + list(extra)
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+            lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# --------------------------
+# Exporters
+# --------------------------
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="trifactor-metrics-http", daemon=True).start()
+    return server
+
+
+def write_file(path):
+    # Atomic replace so a scraper never reads half a file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def _file_writer(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_file(path)
+        except OSError:
+            pass
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_from_env():
+    # Idempotent: cheap to call on every rerun, starts exporters once per process
+    global _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        port = os.environ.get("TRIFACTOR_METRICS_PORT")
+        if port:
+            serve(int(port), os.environ.get("TRIFACTOR_METRICS_HOST", "127.0.0.1"))
+        path = os.environ.get("TRIFACTOR_METRICS_FILE")
+        if path:
+            threading.Thread(
+                target=_file_writer, args=(path, FILE_INTERVAL), name="trifactor-metrics-file", daemon=True
+            ).start()
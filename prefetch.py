@@ -0,0 +1,76 @@
+import functools
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import pick_followup_positions
+from metrics import FOLLOWUP_PREFETCH
+
+# =========================================================
+# Follow-up prefetch (no Streamlit)
+# - while answers come in, the next round's follow-ups are picked on a small
+#   shared thread pool for the targets the answers so far point at
+# - a pick is a pure function of (seed, round, targets, asked positions), so
+#   a prefetched result and one computed on the click are identical, and
+#   reruns never reshuffle a round
+# Pool size: TRIFACTOR_PREFETCH_WORKERS=2
+# =========================================================
+
+_pool = ThreadPoolExecutor(int(os.environ.get("TRIFACTOR_PREFETCH_WORKERS", "2")), thread_name_prefix="trifactor-prefetch")
+
+
+def pick_round(cb, targets, asked, n, seed, round_no):
+    rng = random.Random(f"{seed}/followups/{round_no}/{','.join(targets)}")
+    return pick_followup_positions(cb, targets, asked, n, rng)
+
+
+class FollowupPrefetch:
+    """Per-session holder for the latest prefetched round; pickles empty (a miss just recomputes).
+
+    Holds the pending future only until the pick is in, then just (key, positions).
+    """
+
+    __slots__ = ("key", "future", "done")
+
+    def __init__(self):
+        self.key = None
+        self.future = None
+        self.done = None  # (key, positions) of the last finished pick
+
+    def __reduce__(self):
+        return FollowupPrefetch, ()
+
+    @staticmethod
+    def _key(cb, targets, asked, n, seed, round_no):
+        # The asked set by size and hash: within one seed and round it only ever grows
+        return (cb, tuple(targets), len(asked), hash(frozenset(asked)), n, seed, round_no)
+
+    def submit(self, cb, targets, asked, n, seed, round_no):
+        # No-op while the inputs are unchanged; a superseded pick is cancelled if it hasn't started
+        key = self._key(cb, targets, asked, n, seed, round_no)
+        if key != self.key:
+            if self.future is not None:
+                self.future.cancel()
+            self.key = key
+            self.future = _pool.submit(pick_round, cb, tuple(targets), frozenset(asked), n, seed, round_no)
+            self.future.add_done_callback(functools.partial(self._finished, key))
+
+    def _finished(self, key, future):
+        # Worker thread: keep the latest inputs' picks, drop the future (result() re-checks every key)
+        if not future.cancelled() and future.exception() is None and key == self.key:
+            self.done = (key, future.result())
+        if self.future is future:
+            self.future = None
+
+    def result(self, cb, targets, asked, n, seed, round_no):
+        key = self._key(cb, targets, asked, n, seed, round_no)
+        done = self.done
+        if done is not None and done[0] == key:
+            FOLLOWUP_PREFETCH.inc("ready")
+            return done[1]
+        future = self.future
+        if key == self.key and future is not None:
+            FOLLOWUP_PREFETCH.inc("waited")
+            return future.result()
+        FOLLOWUP_PREFETCH.inc("miss")
+        return pick_round(cb, targets, asked, n, seed, round_no)
@@ -0,0 +1,118 @@
+import cProfile
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+# =========================================================
+# Opt-in per-rerun profiling (no Streamlit)
+#   TRIFACTOR_PROFILE_DIR=/tmp/trifactor-profiles   turns it on
+#   TRIFACTOR_PROFILER=cprofile (default, .pstats) | pyinstrument (.speedscope.json)
+#   TRIFACTOR_PROFILE_MAX_MB=200   oldest files are deleted past this total
+# - one file per script run / fragment rerun: <time>-<stage>-<scope>-<thread>.<ext>
+# - cProfile is process-wide on Python 3.12+, so one run is profiled at a time;
+#   runs that overlap it (other sessions' reruns) go unprofiled
+# - open .pstats with `python -m pstats` or snakeviz, .speedscope.json at speedscope.app
+# =========================================================
+
+PROFILE_DIR = os.environ.get("TRIFACTOR_PROFILE_DIR")
+PROFILER = os.environ.get("TRIFACTOR_PROFILER", "cprofile")
+MAX_BYTES = int(float(os.environ.get("TRIFACTOR_PROFILE_MAX_MB", "200")) * 1024 * 1024)
+
+if PROFILE_DIR and PROFILER == "pyinstrument":
+    try:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+    except ImportError:
+        PROFILER = "cprofile"
+
+
+class _Rotation:
+    """Size-bounded profile directory: oldest files go first once the total passes max_bytes."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._files = None  # deque of (path, size), oldest first
+        self._total = 0
+
+    def _scan(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = [(p, p.stat()) for p in self.directory.iterdir() if p.is_file()]
+        found.sort(key=lambda t: t[1].st_mtime)
+        self._files = deque((p, st.st_size) for p, st in found)
+        self._total = sum(size for _p, size in self._files)
+
+    def path(self, name):
+        with self._lock:
+            if self._files is None:
+                self._scan()
+        return self.directory / name
+
+    def added(self, path):
+        size = path.stat().st_size
+        with self._lock:
+            self._files.append((path, size))
+            self._total += size
+            while self._total > self.max_bytes and len(self._files) > 1:
+                old, old_size = self._files.popleft()
+                self._total -= old_size
+                try:
+                    old.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+_rotation = _Rotation(PROFILE_DIR, MAX_BYTES) if PROFILE_DIR else None
+_cprofile_lock = threading.Lock()
+
+
+def _name(stage, scope, ext):
+    stamp = time.strftime("%Y%m%dT%H%M%S") + f"{time.time() % 1:.6f}"[1:]
+    return f"{stamp}-{stage}-{scope}-{threading.get_ident()}.{ext}"
+
+
+@contextmanager
+def profiled(stage, scope="script"):
+    # No-op unless TRIFACTOR_PROFILE_DIR is set; the profile is written even if the run ends in st.rerun()
+    if _rotation is None:
+        yield
+        return
+
+    if PROFILER == "pyinstrument":
+        prof = Profiler(interval=0.001)
+        prof.start()
+        try:
+            yield
+        finally:
+            prof.stop()
+            path = _rotation.path(_name(stage, scope, "speedscope.json"))
+            path.write_text(prof.output(renderer=SpeedscopeRenderer()), encoding="utf-8")
+            _rotation.added(path)
+        return
+
+    if not _cprofile_lock.acquire(blocking=False):
+        yield
+        return
+    try:
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # Another profiler is active outside this module ("Another profiling tool is already active")
+            prof = None
+        if prof is None:
+            yield
+            return
+        try:
+            yield
+        finally:
+            prof.disable()
+            path = _rotation.path(_name(stage, scope, "pstats"))
+            prof.dump_stats(path)
+            _rotation.added(path)
+    finally:
+        _cprofile_lock.release()
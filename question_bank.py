@@ -0,0 +1,20 @@
+import json
+import os
+from pathlib import Path
+
+# --------------------------
+# Question bank file
+# Every question id must be unique across ALL lenses.
+# {"id": "i01", "text": "...", "variable": "Baseline", "weight": 1.2, "reverse": true}
+# Override the location with TRIFACTOR_BANK=/path/to/questions.json
+# --------------------------
+BANK_PATH = Path(os.environ.get("TRIFACTOR_BANK", Path(__file__).with_name("questions.json")))
+
+
+def bank_mtime(path=BANK_PATH):
+    return os.stat(path).st_mtime_ns
+
+
+def load_question_bank(path=BANK_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
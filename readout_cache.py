@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import engine
+from metrics import READOUT_CACHE
+
+# =========================================================
+# Readout cache (no Streamlit)
+# - bounded LRU (optionally with a TTL) of computed readouts, shared by
+#   every session of the process and by the CLI
+# - key: (lens, scoring version, top, sorted question ids, answer vector);
+#   identical answer sets on one bank + weights share an entry
+# - scoring version = SCORING_VERSION + mtime of the bank in service + VARIABLE_WEIGHTS;
+#   when it changes the whole cache is dropped (invalidate() does it by hand)
+# - readouts are shared between callers: treat them as read-only
+# Size/TTL: TRIFACTOR_READOUT_CACHE_SIZE=1024, TRIFACTOR_READOUT_CACHE_TTL=seconds
+# =========================================================
+
+SCORING_VERSION = 1  # bump when scoring changes in a way the key can't see
+CACHE_SIZE = int(os.environ.get("TRIFACTOR_READOUT_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.environ.get("TRIFACTOR_READOUT_CACHE_TTL", "0")) or None
+
+
+def scoring_version():
+    return (SCORING_VERSION, engine.bank_version(), tuple(engine.VARIABLE_WEIGHTS.items()))
+
+
+class ReadoutCache:
+    """Thread-safe LRU of readouts; computes outside the lock, so two misses on one key may both compute."""
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL, counter=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.counter = counter
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, readout)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def _count(self, result):
+        if result == "hit":
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.counter is not None:
+            self.counter.inc(result)
+
+    def get(self, lens, vector, compute, top=5):
+        """Readout for (lens, answer_vector); compute() builds it on a miss. top=None for full signal lists."""
+        version = scoring_version()
+        key = (lens, top) + vector
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self._count("hit")
+                return entry[1]
+            self._count("miss")
+        readout = compute()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = (now, readout)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return readout
+
+
+_cache = ReadoutCache(counter=READOUT_CACHE)
+
+
+def answer_vector(answers):
+    # {qid: answer} -> (sorted qids, answers in that order); RunningScores keeps its own memoized
+    ids = tuple(sorted(answers))
+    return ids, tuple(answers[qid] for qid in ids)
+
+
+def cached_readout(lens, vector, compute, top=5):
+    return _cache.get(lens, vector, compute, top)
+
+
+def invalidate():
+    # For changes the version can't see, e.g. the bank rewritten within one mtime tick
+    _cache.invalidate()
+
+
+def stats():
+    return {"size": len(_cache), "maxsize": _cache.maxsize, "hits": _cache.hits, "misses": _cache.misses}
@@ -0,0 +1,130 @@
+import random
+from array import array
+
+from engine import compiled_bank, stratified_positions
+
+# =========================================================
+# Compact per-session run state (no Streamlit)
+# - questions are slots: small int arrays of positions into one CompiledBank
+# - answers are a bytearray per slot list, 0..4 or UNANSWERED
+# - the bank is pinned for the run, so a hot reload of questions.json
+#   can't move positions under a session; new runs pick up the new bank
+# - pickled by question id, so a restored run finds its questions in the
+#   current bank however it was edited or reordered
+# =========================================================
+
+UNANSWERED = 0xFF
+
+
+class RunState:
+    """One diagnostic run: 25 base slots (fewer when adaptive) plus the current follow-up round."""
+
+    __slots__ = ("bank", "base", "base_answers", "followups", "followup_answers")
+
+    def __init__(self, bank, positions=()):
+        self.bank = bank
+        self.base = self._slots(positions)
+        self.base_answers = bytearray([UNANSWERED]) * len(self.base)
+        self.followups = self._slots(())
+        self.followup_answers = bytearray()
+
+    @classmethod
+    def sample(cls, lens, k, rng=random):
+        # k distinct positions from the lens' current bank, per-variable quotas by weight
+        cb = compiled_bank(lens)
+        return cls(cb, stratified_positions(cb, k, rng))
+
+    def _slots(self, positions):
+        return array("H" if len(self.bank) <= 0xFFFF else "I", positions)
+
+    @property
+    def lens(self):
+        return self.bank.lens
+
+    # Pickled as question ids + answers only (the bank is shared); restored by id
+    # against the lens' current bank, so edits and reorders can't shift answers.
+    # A run whose questions were removed from the bank can't be restored (ValueError).
+    def __reduce__(self):
+        ids = self.bank.ids
+        return _restore, (
+            self.lens,
+            tuple(ids[p] for p in self.base),
+            bytes(self.base_answers),
+            tuple(ids[p] for p in self.followups),
+            bytes(self.followup_answers),
+        )
+
+    # --------------------------
+    # Base questions
+    # --------------------------
+    @property
+    def base_count(self):
+        return len(self.base)
+
+    def question(self, i):
+        return self.bank.questions[self.base[i]]
+
+    def answer(self, i):
+        a = self.base_answers[i]
+        return None if a == UNANSWERED else a
+
+    def set_answer(self, i, value):
+        self.base_answers[i] = value
+
+    def append(self, position):
+        # Adaptive runs grow one base slot at a time
+        self.base.append(position)
+        self.base_answers.append(UNANSWERED)
+
+    def questions(self):
+        questions = self.bank.questions
+        return [questions[p] for p in self.base]
+
+    def answers(self):
+        # {qid: 0..4} for answered base slots
+        ids = self.bank.ids
+        return {ids[p]: a for p, a in zip(self.base, self.base_answers) if a != UNANSWERED}
+
+    # --------------------------
+    # Follow-ups (current round only)
+    # --------------------------
+    @property
+    def followup_count(self):
+        return len(self.followups)
+
+    def followup_question(self, i):
+        return self.bank.questions[self.followups[i]]
+
+    def followup_answer(self, i):
+        a = self.followup_answers[i]
+        return None if a == UNANSWERED else a
+
+    def set_followup_answer(self, i, value):
+        self.followup_answers[i] = value
+
+    def answered_followups(self):
+        # [(question, answer)] for answered follow-up slots
+        questions = self.bank.questions
+        return [(questions[p], a) for p, a in zip(self.followups, self.followup_answers) if a != UNANSWERED]
+
+    def unasked_count(self):
+        return len(self.bank) - len(set(self.base) | set(self.followups))
+
+    def asked_positions(self):
+        # What a new round counts as asked: the base and the current round
+        asked = set(self.base)
+        asked.update(self.followups)
+        return asked
+
+    def set_followups(self, positions):
+        self.followups = self._slots(positions)
+        self.followup_answers = bytearray([UNANSWERED]) * len(self.followups)
+
+
+def _restore(lens, base, base_answers, followups, followup_answers):
+    cb = compiled_bank(lens)
+    run = RunState(cb, cb.positions_of(base))
+    run.base_answers[:] = base_answers
+    run.followups = run._slots(cb.positions_of(followups))
+    run.followup_answers = bytearray(followup_answers)
+    return run
@@ -0,0 +1,199 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from trends import TREND_SCHEMA, handle_salt, load_trend, record_run
+
+# =========================================================
+# Local run store (SQLite, WAL)
+# - run / answer / variable_score tables, indexed on lens + time
+# - trend rollups (trends.py) updated in the same transaction as each run
+# - save() only enqueues; a background thread writes in batches
+# - No Streamlit: the app holds one RunStore per process
+# Override the location with TRIFACTOR_DB=/path/to/runs.db
+# =========================================================
+
+log = logging.getLogger(__name__)
+
+DB_PATH = Path(os.environ.get("TRIFACTOR_DB", Path(__file__).with_name("trifactor_runs.db")))
+
+SCHEMA_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT,
+    user_id TEXT,
+    lens TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    overall REAL NOT NULL,
+    targets TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    seed INTEGER
+);
+CREATE INDEX IF NOT EXISTS run_lens_created ON run (lens, created_at);
+CREATE INDEX IF NOT EXISTS run_created ON run (created_at);
+CREATE INDEX IF NOT EXISTS run_user_lens_created ON run (user_id, lens, created_at) WHERE user_id IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS answer (
+    run_id INTEGER NOT NULL REFERENCES run (id) ON DELETE CASCADE,
+    qid TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (run_id, qid)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS variable_score (
+    run_id INTEGER NOT NULL REFERENCES run (id) ON DELETE CASCADE,
+    variable TEXT NOT NULL,
+    pct REAL NOT NULL,
+    zone TEXT NOT NULL,
+    volatility REAL NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (run_id, variable)
+) WITHOUT ROWID;
+""" + TREND_SCHEMA
+
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def init_db(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 1:
+        # v1 -> v2: runs gain a user key for trends
+        conn.execute("ALTER TABLE run ADD COLUMN user_id TEXT")
+    if 1 <= version < 4:
+        # v3 -> v4: runs keep their run_seed, so a saved run can be replayed
+        conn.execute("ALTER TABLE run ADD COLUMN seed INTEGER")
+    conn.executescript(SCHEMA)
+    if 1 <= version < 3:
+        # v2 -> v3: user keys are salted per deployment. The old unsalted keys can't be
+        # matched any more and can be guessed from a handle, so they are dropped
+        conn.execute("UPDATE run SET user_id = NULL WHERE user_id IS NOT NULL")
+        conn.execute("DELETE FROM trend")
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    conn.commit()
+
+
+def run_row(readout, phase, answers, session_id=None, created_at=None, user_id=None, seed=None):
+    # readout: engine.build_readout / RunningScores.readout dict; seed: the run's run_seed
+    return {
+        "session_id": session_id,
+        "user_id": user_id,
+        "seed": seed,
+        "lens": readout["lens"],
+        "phase": phase,
+        "overall": readout["overall"],
+        "targets": list(readout["targets"]),
+        "created_at": time.time() if created_at is None else created_at,
+        "answers": dict(answers),
+        "variables": {
+            v: (info["pct"], info["zone"], info["volatility"], info["n"])
+            for v, info in readout["per_variable"].items()
+        },
+    }
+
+
+def write_runs(conn, rows):
+    # One transaction for the whole batch
+    with conn:
+        for row in rows:
+            cur = conn.execute(
+                "INSERT INTO run (session_id, user_id, lens, phase, overall, targets, created_at, seed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    row["session_id"],
+                    row.get("user_id"),
+                    row["lens"],
+                    row["phase"],
+                    row["overall"],
+                    json.dumps(row["targets"]),
+                    row["created_at"],
+                    row.get("seed"),
+                ),
+            )
+            run_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO answer (run_id, qid, value) VALUES (?, ?, ?)",
+                [(run_id, qid, int(a)) for qid, a in row["answers"].items()],
+            )
+            conn.executemany(
+                "INSERT INTO variable_score (run_id, variable, pct, zone, volatility, n) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, v, *vals) for v, vals in row["variables"].items()],
+            )
+            record_run(conn, row, run_id)
+
+
+class RunStore:
+    """Queue-backed writer: save() never touches the database on the caller's thread."""
+
+    def __init__(self, path=DB_PATH, batch_size=500, max_wait=0.25):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._local = threading.local()
+        conn = connect(path)
+        init_db(conn)
+        self.salt = handle_salt(conn)  # for trends.user_key
+        conn.close()
+        self._thread = threading.Thread(target=self._writer, name="trifactor-run-store", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def save(self, row):
+        self._queue.put(row)
+
+    def trend(self, user_id, lens):
+        # Rollup for (user, lens) as of the last written run, or None.
+        # One primary-key read on a per-thread connection (WAL: never blocks the writer).
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return load_trend(conn, user_id, lens)
+
+    def flush(self):
+        # Block until everything queued so far is on disk
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _writer(self):
+        conn = connect(self.path)
+        try:
+            while True:
+                row = self._queue.get()
+                batch = [row]
+                deadline = time.monotonic() + self.max_wait
+                while row is not None and len(batch) < self.batch_size:
+                    try:
+                        row = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    batch.append(row)
+                rows = [r for r in batch if r is not None]
+                try:
+                    if rows:
+                        write_runs(conn, rows)
+                except sqlite3.Error:
+                    log.exception("run store: dropped a batch of %d runs", len(rows))
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(rows) < len(batch):
+                    return
+        finally:
+            conn.close()
@@ -0,0 +1,16 @@
+import importlib
+
+# =========================================================
+# Stage registry
+# - one module per stage, each with a render() function
+# - a stage's module is imported the first time a session reaches it,
+#   so a rerun only loads and runs the code for the active stage
+# =========================================================
+
+STAGES = ("setup", "questions", "results", "followups", "export_form", "results2")
+
+
+def render(stage):
+    if stage not in STAGES:
+        raise KeyError(f"unknown stage {stage!r}")
+    importlib.import_module(f"{__name__}.{stage}").render()
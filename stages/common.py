@@ -0,0 +1,239 @@
+import functools
+import os
+import random
+import time
+
+import streamlit as st
+
+import adaptive
+from engine import RunningScores, choose_followup_targets, clamp, compiled_bank
+from metrics import RERUNS_PER_RUN, STAGE_SECONDS
+from prefetch import FollowupPrefetch
+from profiling import profiled
+from readout_cache import cached_readout
+from run_state import UNANSWERED, RunState
+from run_store import RunStore, run_row
+from trends import TREND_PHASE, apply_row, user_key
+
+# =========================================================
+# Shared by the stage modules: constants, run store, run lifecycle
+# =========================================================
+
+# --------------------------
+# Constants / Scale
+# --------------------------
+LENSES = ["Interpersonal", "Financial", "Big Picture"]
+
+SCALE_LABELS = {
+    0: "0 — Not at all / Never",
+    1: "1 — Rarely",
+    2: "2 — Sometimes",
+    3: "3 — Often",
+    4: "4 — Almost always",
+}
+
+QUESTIONS_PER_RUN = 25
+FOLLOWUPS_PER_ROUND = 10
+
+# Per deployment: 0 asks fixed-length runs one question at a time (a rerun per
+# answer); N > 0 shows them in st.form pages of N (25 = one page, one submit)
+def _page_size(value):
+    size = int(value or 0)
+    if size < 0:
+        raise ValueError(f"TRIFACTOR_QUESTION_PAGE_SIZE must be >= 0, got {value!r}")
+    return size
+
+
+QUESTION_PAGE_SIZE = _page_size(os.environ.get("TRIFACTOR_QUESTION_PAGE_SIZE"))
+
+MODES = {
+    "fixed": "Fixed — all 25 questions",
+    "adaptive": "Adaptive — stops once your weakest area is clear (up to 25)",
+}
+
+# Saved/exported phase per mode: (first readout, after follow-ups). Adaptive runs ask fewer
+# questions, so they get their own phases and stay out of the weekly trend (TREND_PHASE)
+PHASES = {
+    "fixed": ("after_25", "after_25_plus_10"),
+    "adaptive": ("adaptive", "adaptive_plus_10"),
+}
+
+
+# --------------------------
+# Run store
+# --------------------------
+@st.cache_resource
+def run_store():
+    # One background writer per server process, shared by all sessions
+    return RunStore()
+
+
+def current_readout():
+    # Readout of the session's current answers, shared with identical answer sets
+    running = st.session_state.running
+    lens = st.session_state.lens
+    return cached_readout(lens, running.answer_vector(), lambda: running.readout(lens))
+
+
+def run_phase(followups=False):
+    # Phase name for this session's run: the first readout, or the one after follow-ups
+    return PHASES[st.session_state.mode][followups]
+
+
+def save_run(phase):
+    # Enqueue only — the writer thread batches inserts, so the click doesn't wait on disk
+    running = st.session_state.running
+    lens = st.session_state.lens
+    user_id = user_key(st.session_state.user_handle, run_store().salt)
+    row = run_row(
+        current_readout(),
+        phase,
+        running.answers(),
+        session_id=st.session_state.session_id,
+        user_id=user_id,
+        seed=st.session_state.run_seed,
+    )
+    if phase == run_phase():
+        RERUNS_PER_RUN.observe(st.session_state.reruns)
+    if user_id is not None and phase == TREND_PHASE:
+        # One primary-key read of the stored rollup, then fold this run in locally
+        st.session_state.trend = apply_row(run_store().trend(user_id, lens), row)
+    run_store().save(row)
+
+
+# --------------------------
+# Run lifecycle
+# --------------------------
+def reset_run():
+    st.session_state.stage = "setup"
+    st.session_state.run = None
+    st.session_state.run_seed = None
+    st.session_state.idx = 0
+    st.session_state.followup_idx = 0
+    st.session_state.followup_targets = []
+    st.session_state.followup_round = 0
+    st.session_state.prefetch = FollowupPrefetch()
+    st.session_state.running = None
+    st.session_state.trend = None
+    st.session_state.reruns = 0
+
+
+def end_followup_round():
+    # Only the latest follow-up round is scored: put base answers back, drop the rest
+    run = st.session_state.run
+    running = st.session_state.running
+    base = {q["id"]: (q, a) for q, a in zip(run.questions(), run.base_answers)}
+    for q, _a in run.answered_followups():
+        q_base, a_base = base.get(q["id"], (None, UNANSWERED))
+        if a_base != UNANSWERED:
+            running.set(q_base, a_base)
+        else:
+            running.remove(q["id"])
+
+
+def run_rng(*salt):
+    # Deterministic per run: the session's run_seed plus where in the run we are
+    return random.Random("/".join(map(str, (st.session_state.run_seed,) + salt)))
+
+
+def start_run(lens, seed=None):
+    # Fresh sample of questions for `lens`; answers, follow-ups and trend start over.
+    # The same seed (and answers, in adaptive mode) replays the same questions.
+    reset_run()
+    st.session_state.run_seed = random.getrandbits(32) if seed is None else seed
+    if st.session_state.mode == "adaptive":
+        run = RunState(compiled_bank(lens))
+    else:
+        run = RunState.sample(lens, QUESTIONS_PER_RUN, run_rng("base"))
+    # Scores are pinned to the run's bank, like its slots
+    st.session_state.running = RunningScores(run.bank)
+    if st.session_state.mode == "adaptive":
+        run.append(adaptive.next_position(run.bank, (), st.session_state.running, run_rng("adaptive", 0)))
+    st.session_state.run = run
+    st.session_state.stage = "questions"
+
+
+def _round_inputs(targets):
+    run = st.session_state.run
+    return run.bank, targets, run.asked_positions(), FOLLOWUPS_PER_ROUND, st.session_state.run_seed, st.session_state.followup_round
+
+
+def prefetch_followups():
+    # After each answer: pick the next round in the background for the targets the answers so far give
+    targets = choose_followup_targets(st.session_state.running.per_variable())
+    st.session_state.prefetch.submit(*_round_inputs(targets))
+
+
+def start_followup_round(targets):
+    # Same picks whether the prefetch got there first or not
+    positions = st.session_state.prefetch.result(*_round_inputs(targets))
+    st.session_state.run.set_followups(positions)
+    st.session_state.followup_round += 1
+    st.session_state.followup_targets = targets
+    st.session_state.followup_idx = 0
+    st.session_state.stage = "followups"
+
+
+def step(key, delta, total):
+    # on_click callback: runs before the fragment reruns, so one click = one fragment run
+    st.session_state[key] = clamp(st.session_state[key] + delta, 0, total - 1)
+
+
+def adaptive_step():
+    # on_click for Next in adaptive mode: past the last asked question, ask the most
+    # informative next one unless the weakest variable is already clear
+    run = st.session_state.run
+    if st.session_state.idx < run.base_count - 1:
+        st.session_state.idx += 1
+        return
+    running = st.session_state.running
+    if adaptive.assess(run.bank, running, run.base_count)[2]:
+        return
+    position = adaptive.next_position(run.bank, set(run.base), running, run_rng("adaptive", run.base_count))
+    if position is not None:
+        run.append(position)
+        st.session_state.idx += 1
+
+
+def page_radio_key(q, i):
+    return f"radio_page_{q['id']}_{i}_v1"
+
+
+def submit_page(start, end, action):
+    # on_click for a question page's submit buttons: write the page's answers in one go, then move
+    run = st.session_state.run
+    running = st.session_state.running
+    for i in range(start, end):
+        q = run.question(i)
+        a = int(st.session_state[page_radio_key(q, i)])
+        run.set_answer(i, a)
+        running.set(q, a)
+    prefetch_followups()
+    if action == "back":
+        st.session_state.idx = max(0, start - QUESTION_PAGE_SIZE)
+    elif action == "next":
+        st.session_state.idx = end
+    else:
+        save_run(run_phase())
+        st.session_state.stage = "results"
+
+
+def fragment_run(stage):
+    # Inside @st.fragment: time (and optionally profile) fragment-only reruns, counting them toward the session's reruns
+    # (when the full script calls the fragment, app.py already times and counts that run)
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if st.session_state.in_script_run:
+                return fn(*args, **kwargs)
+            st.session_state.reruns += 1
+            t0 = time.perf_counter()
+            try:
+                with profiled(stage, "fragment"):
+                    return fn(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - t0, stage, "fragment")
+
+        return inner
+
+    return wrap
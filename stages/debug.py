@@ -0,0 +1,32 @@
+import streamlit as st
+
+import memory
+
+# --------------------------
+# Memory debug panel (TRIFACTOR_MEMORY_DEBUG=1)
+# --------------------------
+METER_KEY = "memory_meter"
+
+
+def render_memory():
+    memory.start_tracing()
+    if METER_KEY not in st.session_state:
+        st.session_state[METER_KEY] = memory.meter(st.session_state.session_id)
+    meter = st.session_state[METER_KEY]
+    meter.measure({k: st.session_state[k] for k in st.session_state.keys() if k != METER_KEY}, st.session_state.stage)
+
+    with st.sidebar.expander("Memory (debug)"):
+        st.write(f"This session: **{meter.total:,} bytes**")
+        for key, size in meter.sizes.items():
+            st.caption(f"{key}: {size:,}")
+
+        count, total = memory.live_sessions()
+        st.write(f"Live sessions: **{count}** (~{total:,} bytes, as of each one's last rerun)")
+
+        if memory.TRACE_FRAMES:
+            # A snapshot walks every traced block, so only on demand
+            if st.button("Snapshot allocations", key="btn_memory_snapshot_v1"):
+                current, peak, sites = memory.traced()
+                st.write(f"tracemalloc: {current:,} bytes now, {peak:,} peak")
+                for site, size in sites:
+                    st.caption(f"{size:,} — {site}")
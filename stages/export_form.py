@@ -0,0 +1,39 @@
+import streamlit as st
+
+from engine import export_record
+from stages.common import current_readout, run_phase, save_run
+from stages.readout import render_readout
+
+# --------------------------
+# Export Form (between followups and results2)
+# --------------------------
+
+
+def render():
+    lens = st.session_state.lens
+    run = st.session_state.run
+
+    # Running scores already hold base answers merged with this follow-up round
+    running = st.session_state.running
+    merged_answers = running.answers()
+
+    readout2 = render_readout(
+        title=f"Readout (after {run.base_count} questions + {run.followup_count} follow-ups) — preview",
+        lens=lens,
+        readout=current_readout(),
+    )
+
+    st.divider()
+    st.write("### Save this run")
+    st.caption("Continue saves this run to the local run store and opens your results.")
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.write("### Export (copy/paste)")
+        st.code(export_record(readout2, run_phase(followups=True), merged_answers, seed=st.session_state.run_seed), language="python")
+
+    with col2:
+        if st.button("Continue to Results", type="primary", key="btn_continue_results2_v1"):
+            save_run(run_phase(followups=True))
+            st.session_state.stage = "results2"
+            st.rerun()
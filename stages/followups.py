@@ -0,0 +1,55 @@
+import streamlit as st
+
+from lens_text import lens_translation
+from stages.common import SCALE_LABELS, fragment_run, prefetch_followups, step
+
+# --------------------------
+# Follow-ups (10)
+# --------------------------
+@st.fragment
+@fragment_run("followups")
+def followup_card():
+    lens = st.session_state.lens
+    run = st.session_state.run
+    total = run.followup_count
+    idx = st.session_state.followup_idx
+
+    st.subheader(f"Follow-ups — {idx+1} of {total}")
+    st.caption("Targeted to your lowest zones. Same scoring.")
+    st.progress((idx) / total)
+
+    q = run.followup_question(idx)
+    st.write(f"**{q['text']}**")
+    st.caption(f"Measures: {lens_translation(lens, q['variable'])}")
+
+    current = run.followup_answer(idx)
+    options = list(SCALE_LABELS.keys())
+
+    choice = st.radio(
+        "Choose one:",
+        options,
+        index=options.index(current) if current in options else 2,
+        format_func=lambda x: SCALE_LABELS[x],
+        key=f"radio_follow_{q['id']}_{idx}_v1",
+    )
+    run.set_followup_answer(idx, int(choice))
+    st.session_state.running.set(q, int(choice))
+    prefetch_followups()
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        st.button(
+            "Back", disabled=(idx == 0), key=f"btn_fu_back_{idx}_v1", on_click=step, args=("followup_idx", -1, total)
+        )
+    with col2:
+        st.button(
+            "Next", disabled=(idx >= total - 1), key=f"btn_fu_next_{idx}_v1", on_click=step, args=("followup_idx", 1, total)
+        )
+    with col3:
+        if st.button("Finish follow-ups & Re-score", type="primary", key="btn_fu_finish_v1"):
+            st.session_state.stage = "export_form"
+            st.rerun()
+
+
+def render():
+    followup_card()
@@ -0,0 +1,130 @@
+import streamlit as st
+
+import adaptive
+from lens_text import lens_translation
+from stages.common import (
+    QUESTION_PAGE_SIZE,
+    SCALE_LABELS,
+    adaptive_step,
+    fragment_run,
+    page_radio_key,
+    prefetch_followups,
+    run_phase,
+    save_run,
+    step,
+    submit_page,
+)
+
+# --------------------------
+# Questions (25, or adaptive)
+# One card at a time, or st.form pages when QUESTION_PAGE_SIZE is set
+# --------------------------
+
+
+# Only this fragment reruns on radio changes and Back/Next; the rest of the
+# script (sidebar, footer) runs again only on stage changes.
+@st.fragment
+@fragment_run("questions")
+def question_card():
+    lens = st.session_state.lens
+    run = st.session_state.run
+    total = run.base_count
+    idx = st.session_state.idx
+    is_adaptive = st.session_state.mode == "adaptive"
+
+    if is_adaptive:
+        st.subheader(f"{lens} lens — Question {idx+1}")
+    else:
+        st.subheader(f"{lens} lens — Question {idx+1} of {total}")
+        st.progress((idx) / total)
+
+    q = run.question(idx)
+    st.write(f"**{q['text']}**")
+    st.caption(f"Measures: {lens_translation(lens, q['variable'])}")
+
+    current = run.answer(idx)
+    options = list(SCALE_LABELS.keys())
+
+    choice = st.radio(
+        "Choose one:",
+        options,
+        index=options.index(current) if current in options else 2,
+        format_func=lambda x: SCALE_LABELS[x],
+        key=f"radio_main_{q['id']}_{idx}_v1",
+    )
+    run.set_answer(idx, int(choice))
+    st.session_state.running.set(q, int(choice))
+    prefetch_followups()
+
+    if is_adaptive:
+        # Assessed after this answer, so the card reflects what Next would do
+        weakest, p, done = adaptive.assess(run.bank, st.session_state.running, total)
+        st.progress(min(p / adaptive.CONFIDENCE, 1.0))
+        st.caption(f"{p:.0%} sure your weakest area is {lens_translation(lens, weakest)}")
+        at_end = done and idx == total - 1
+        if at_end:
+            st.success(f"That’s clear enough after {total} questions — Finish & Score when you’re ready.")
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        st.button("Back", disabled=(idx == 0), key=f"btn_back_{idx}_v1", on_click=step, args=("idx", -1, total))
+    with col2:
+        if is_adaptive:
+            st.button("Next", disabled=at_end, key=f"btn_next_{idx}_v1", on_click=adaptive_step)
+        else:
+            st.button("Next", disabled=(idx >= total - 1), key=f"btn_next_{idx}_v1", on_click=step, args=("idx", 1, total))
+    with col3:
+        if st.button("Finish & Score", type="primary", key="btn_finish_score_v1"):
+            save_run(run_phase())
+            st.session_state.stage = "results"
+            st.rerun()
+
+
+# Radios inside a form don't rerun anything; answers are written by the
+# submit callback, so each page costs one script run.
+def question_page():
+    lens = st.session_state.lens
+    run = st.session_state.run
+    total = run.base_count
+    start = st.session_state.idx
+    end = min(start + QUESTION_PAGE_SIZE, total)
+
+    if end - start == total:
+        st.subheader(f"{lens} lens — {total} questions")
+    else:
+        st.subheader(f"{lens} lens — Questions {start+1}–{end} of {total}")
+        st.progress(start / total)
+
+    options = list(SCALE_LABELS.keys())
+    with st.form(key=f"form_questions_{start}_v1"):
+        for i in range(start, end):
+            q = run.question(i)
+            st.write(f"**{i+1}. {q['text']}**")
+            st.caption(f"Measures: {lens_translation(lens, q['variable'])}")
+            current = run.answer(i)
+            st.radio(
+                "Choose one:",
+                options,
+                index=options.index(current) if current in options else 2,
+                format_func=lambda x: SCALE_LABELS[x],
+                key=page_radio_key(q, i),
+            )
+
+        # Submit buttons are scoped to their form, which has its own key
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            if start > 0:
+                st.form_submit_button("Back", on_click=submit_page, args=(start, end, "back"))
+        with col2:
+            if end < total:
+                st.form_submit_button("Next page", type="primary", on_click=submit_page, args=(start, end, "next"))
+            else:
+                st.form_submit_button("Finish & Score", type="primary", on_click=submit_page, args=(start, end, "finish"))
+
+
+def render():
+    # Adaptive runs choose each question from the previous answers, so they stay one at a time
+    if QUESTION_PAGE_SIZE and st.session_state.mode == "fixed":
+        question_page()
+    else:
+        question_card()
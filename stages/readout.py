@@ -0,0 +1,117 @@
+import streamlit as st
+
+from engine import VARIABLE_WEIGHTS
+from lens_text import compassionate_summary, compassionate_zone_line, lens_readout_intro, lens_translation
+from metrics import SCORING_SECONDS, timed
+from trends import deltas
+
+# --------------------------
+# Readout renderer (results, export_form and results2)
+# --------------------------
+@timed(SCORING_SECONDS, "render_readout")
+def render_readout(title, lens, readout):
+    overall = readout["overall"]
+    per_variable = readout["per_variable"]
+    targets = readout["targets"]
+
+    st.subheader(title)
+    st.write(lens_readout_intro(lens))
+    st.metric("Overall Score (0–100)", f"{overall:.1f}")
+
+    st.write("### Category scores")
+    for v in VARIABLE_WEIGHTS.keys():
+        if v not in per_variable:
+            continue
+        info = per_variable[v]
+        label = lens_translation(lens, v)
+        st.write(
+            f"- **{label}**: **{info['pct']:.1f}** — {compassionate_zone_line(info['zone'])} "
+            f"(volatility {info['volatility']:.0f}/100)"
+        )
+        # Explain volatility cause
+        if v in readout["spread"]:
+            strongest, weakest = readout["spread"][v]
+            st.caption(
+                f"Volatility here comes from inconsistency between: "
+                f"“{strongest[3]['text']}” and “{weakest[3]['text']}”."
+            )
+
+    if readout["lowest"] is not None:
+        lowest = readout["lowest"]
+        highest = readout["highest"]
+        low_label = lens_translation(lens, lowest)
+        high_label = lens_translation(lens, highest)
+
+        # Verdict line
+        st.markdown(
+            f"**Right now, the system isn’t failing everywhere — it’s failing most at _{low_label}_.**"
+        )
+
+        st.write("### Where you are")
+        st.write(f"- **What’s holding steady:** {high_label} (**{per_variable[highest]['pct']:.1f}**)")
+        st.write(
+            f"- **Where pressure is building:** {low_label} (**{per_variable[lowest]['pct']:.1f}**) — "
+            f"{compassionate_zone_line(per_variable[lowest]['zone'])}"
+        )
+        st.write(compassionate_summary(lens, low_label))
+
+        st.write("### What’s dragging you down (lowest signals)")
+        for v, s, w, q, a in readout["signals"][:5]:
+            st.write(f"- {q['text']}  \n  ↳ signal **{s}/4** (weight {w})")
+
+        st.write("### Start here (smallest stabilizing lever)")
+        if readout["lever"] is not None:
+            v, s, w, q, a = readout["lever"]
+            st.write(f"**Start here:** {q['text']}")
+            st.caption("You’re not fixing everything at once. You’re stabilizing the weakest point first.")
+
+        # Leash block
+        st.divider()
+        st.markdown(
+            "**This tool shows you where the pressure is.**  \n"
+            "**It does not design the fix.**"
+        )
+        st.markdown(
+            "If you’re trying to resolve something complex, layered, or long-standing, "
+            "the next step isn’t more questions — it’s interpretation."
+        )
+        st.markdown("All contact and follow-up options are provided inside the app.")
+        st.caption(
+            "Trifactor is a pressure-mapping tool for clarity and prioritization. "
+            "It is not therapy, coaching, or professional advice."
+        )
+        st.caption(
+            "Run this once a week. If the lowest area doesn’t change after two runs, "
+            "you’re pushing the wrong lever."
+        )
+
+        st.write("### Continue evaluation focus")
+        st.write("- We’ll ask 10 follow-ups mainly in these areas:")
+        for v in targets:
+            st.write(f"  - {lens_translation(lens, v)}")
+
+    return readout
+
+
+def render_trend(lens, trend):
+    # trend: rollup dict from trends.apply_run — no history is read here
+    if trend is None:
+        return
+    st.write("### Your trend")
+    if trend["runs"] < 2:
+        st.caption("First saved run under this handle. Come back next week to see what moved.")
+        return
+
+    st.write(f"Runs so far with this lens: **{trend['runs']}**")
+    lowest = trend["recent_lowest"][0]
+    if trend["lowest_streak"] >= 2:
+        st.warning(
+            f"**{lens_translation(lens, lowest)}** has been your lowest area {trend['lowest_streak']} runs in a row. "
+            "If it isn’t moving, you’re pushing the wrong lever."
+        )
+    changes = deltas(trend)
+    for v in VARIABLE_WEIGHTS.keys():
+        if v in changes:
+            st.write(f"- {lens_translation(lens, v)}: **{changes[v]:+.1f}** since last run")
+    if trend["prev_overall"] is not None:
+        st.caption(f"Overall: {trend['prev_overall']:.1f} → {trend['last_overall']:.1f}")
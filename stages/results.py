@@ -0,0 +1,47 @@
+import streamlit as st
+
+from engine import export_record
+from stages.common import FOLLOWUPS_PER_ROUND, current_readout, reset_run, run_phase, start_followup_round, start_run
+from stages.readout import render_readout, render_trend
+
+# --------------------------
+# Results (after 25)
+# --------------------------
+
+
+def render():
+    lens = st.session_state.lens
+    run = st.session_state.run
+
+    readout = render_readout(
+        title=f"Readout (after {run.base_count} questions)",
+        lens=lens,
+        readout=current_readout(),
+    )
+    render_trend(lens, st.session_state.trend)
+    if st.session_state.mode == "adaptive" and st.session_state.user_handle.strip():
+        st.caption("Adaptive runs aren't part of your weekly trend: only fixed 25-question runs are, so every point compares like with like.")
+
+    st.divider()
+
+    targets = readout["targets"]
+    # Follow-ups only repeat when fewer unasked questions are left than a round needs
+    if run.unasked_count() < FOLLOWUPS_PER_ROUND:
+        st.info("Follow-ups may repeat right now because each lens only has 25 questions. Add more questions to remove repeats.")
+
+    colA, colB, colC = st.columns([2, 1, 1])
+    with colA:
+        if st.button("Continue evaluation (10 follow-ups)", type="primary", key="btn_continue_fu_v1"):
+            start_followup_round(targets)
+            st.rerun()
+    with colB:
+        if st.button("New run (same lens)", key="btn_new_run_same_v1"):
+            start_run(lens)
+            st.rerun()
+    with colC:
+        if st.button("Change lens", key="btn_change_lens_v1"):
+            reset_run()
+            st.rerun()
+
+    st.write("### Export (copy/paste)")
+    st.code(export_record(readout, run_phase(), run.answers(), seed=st.session_state.run_seed), language="python")
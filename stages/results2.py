@@ -0,0 +1,44 @@
+import streamlit as st
+
+from engine import export_record
+from stages.common import current_readout, end_followup_round, reset_run, run_phase, start_followup_round, start_run
+from stages.readout import render_readout
+
+# --------------------------
+# Results (after 25 + 10)
+# --------------------------
+
+
+def render():
+    lens = st.session_state.lens
+    run = st.session_state.run
+
+    # Running scores already hold base answers merged with this follow-up round
+    running = st.session_state.running
+    merged_answers = running.answers()
+
+    readout2 = render_readout(
+        title=f"Readout (after {run.base_count} questions + {run.followup_count} follow-ups)",
+        lens=lens,
+        readout=current_readout(),
+    )
+
+    st.divider()
+    st.write("### Export (copy/paste)")
+    st.code(export_record(readout2, run_phase(followups=True), merged_answers, seed=st.session_state.run_seed), language="python")
+
+    colA, colB, colC = st.columns([2, 1, 1])
+    with colA:
+        if st.button("Run another 10 follow-ups", type="primary", key="btn_more_fu_v1"):
+            next_targets = readout2["targets"]
+            end_followup_round()
+            start_followup_round(next_targets)
+            st.rerun()
+    with colB:
+        if st.button("New run (same lens)", key="btn_new_run_same2_v1"):
+            start_run(lens)
+            st.rerun()
+    with colC:
+        if st.button("Change lens", key="btn_change_lens2_v1"):
+            reset_run()
+            st.rerun()
@@ -0,0 +1,55 @@
+import streamlit as st
+
+from stages.common import LENSES, MODES, start_run
+from trends import new_handle
+
+# --------------------------
+# Setup Screen (Lens Picker)
+# --------------------------
+
+
+def use_new_handle():
+    # on_click: fill the handle box with a random handle (dropping the widget's state lets `value` win)
+    st.session_state.user_handle = new_handle()
+    st.session_state.pop("text_user_handle_v1", None)
+
+
+def render():
+    st.subheader("Pick a lens to begin")
+
+    st.session_state.lens = st.radio(
+        "Is this interpersonal, financial, or big picture?",
+        LENSES,
+        index=LENSES.index(st.session_state.lens),
+        key="radio_lens_setup_v1",
+    )
+
+    st.session_state.user_handle = st.text_input(
+        "Private handle (optional — use the same one each week to see your trend)",
+        value=st.session_state.user_handle,
+        key="text_user_handle_v1",
+    )
+    st.caption(
+        "Your handle works like a password: anyone who enters the same one sees its trend. "
+        "Names are easy to guess, so use a generated handle and keep it somewhere safe."
+    )
+    st.button("Generate a private handle", on_click=use_new_handle, key="btn_new_handle_v1")
+
+    modes = list(MODES)
+    st.session_state.mode = st.radio(
+        "How many questions?",
+        modes,
+        index=modes.index(st.session_state.mode),
+        format_func=MODES.get,
+        key="radio_mode_setup_v1",
+    )
+
+    st.caption(
+    "This doesn’t give insight. It gives prioritization."
+    "You’ll see which part is actually costing you the most right now."
+)
+
+    label = "Start 25 questions" if st.session_state.mode == "fixed" else "Start adaptive questions"
+    if st.button(label, type="primary", key="btn_start_25_v1"):
+        start_run(st.session_state.lens)
+        st.rerun()
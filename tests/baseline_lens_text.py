@@ -0,0 +1,111 @@
+# The lens text lookups as they were before the catalog (lens_text.py before user-020),
+# kept verbatim as the reference the catalog must reproduce
+
+
+def zone_message(zone: str) -> str:
+    return {
+        "RED": "broken — needs urgent attention",
+        "YELLOW": "unstable — fragile under pressure",
+        "GREEN": "solid — working well",
+    }[zone]
+
+
+def lens_focus(lens: str) -> str:
+    return {
+        "Interpersonal": "relationship tension, clarity, boundaries, execution",
+        "Financial": "money stability, buffer, boundaries, execution",
+        "Big Picture": "mission clarity, resources, focus, execution, feedback",
+    }[lens]
+
+
+def variable_translation(lens: str, var: str) -> str:
+    translations = {
+        "Interpersonal": {
+            "Baseline": "Emotional stability under contact",
+            "Clarity": "Knowing what you want / what's true",
+            "Resources": "Support & emotional capacity",
+            "Boundaries": "Ability to hold limits",
+            "Execution": "Following through on difficult conversations",
+            "Feedback": "Repair & learning from conflict",
+        },
+        "Financial": {
+            "Baseline": "Stability under financial stress",
+            "Clarity": "Knowing your numbers & priorities",
+            "Resources": "Income, buffer, tools",
+            "Boundaries": "Control over spending & exposure",
+            "Execution": "Actually doing the necessary actions",
+            "Feedback": "Reviewing & closing leaks",
+        },
+        "Big Picture": {
+            "Baseline": "Overall momentum & stability",
+            "Clarity": "Clear direction & next step",
+            "Resources": "Energy, support, environment",
+            "Boundaries": "Protecting focus & saying no",
+            "Execution": "Shipping & completing work",
+            "Feedback": "Measuring & iterating",
+        },
+    }
+    return translations.get(lens, {}).get(var, var)
+
+
+def pressure_focus_summary(lens: str, weakest_var: str) -> str:
+    summaries = {
+        "Interpersonal": f"Biggest pressure is in **{weakest_var}** — likely too much emotional load or poor resolution patterns.",
+        "Financial": f"Biggest pressure is in **{weakest_var}** — usually buffer, system, or leak problem.",
+        "Big Picture": f"Biggest pressure is in **{weakest_var}** — goal is real, but structure/support isn't matching.",
+    }
+    return summaries.get(lens, f"Pressure concentrates in **{weakest_var}**.")
+
+
+def compassionate_zone_line(zone: str) -> str:
+    return {
+        "RED": "needs support now (signal, not failure)",
+        "YELLOW": "workable, but inconsistent under stress",
+        "GREEN": "stable and helping you",
+    }.get(zone, zone)
+
+
+def lens_readout_intro(lens: str) -> str:
+    if lens == "Interpersonal":
+        return "Interpreting through **relationship dynamics**: tension, clarity, boundaries, follow-through."
+    if lens == "Financial":
+        return "Interpreting through **money stability + control**: clarity, buffer, boundaries, execution."
+    return "Interpreting through **mission control**: clarity, focus, resources, execution, feedback loops."
+
+
+def lens_translation(lens: str, variable: str) -> str:
+    mapping = {
+        "Interpersonal": {
+            "Baseline": "Emotional baseline under contact",
+            "Clarity": "What you want / what’s true",
+            "Resources": "Support + emotional bandwidth",
+            "Boundaries": "Limits + self-respect in action",
+            "Execution": "Having the talk / doing the thing",
+            "Feedback": "Repair, learning, reality-checking",
+        },
+        "Financial": {
+            "Baseline": "Stability under money stress",
+            "Clarity": "Knowing your numbers + priorities",
+            "Resources": "Income, buffer, tools",
+            "Boundaries": "Control over spending + exposure",
+            "Execution": "Doing the necessary money actions",
+            "Feedback": "Reviewing + closing leaks",
+        },
+        "Big Picture": {
+            "Baseline": "Momentum + overall stability",
+            "Clarity": "Direction + next step",
+            "Resources": "Energy, support, environment",
+            "Boundaries": "Protecting focus + saying no",
+            "Execution": "Shipping + finishing work",
+            "Feedback": "Measuring + iterating",
+        },
+    }
+    return mapping.get(lens, {}).get(variable, variable)
+
+
+def compassionate_summary(lens: str, low_label: str) -> str:
+    if lens == "Interpersonal":
+        return f"Most of the strain is landing on **{low_label}**. That’s where contact is costing you more than it gives back."
+    if lens == "Financial":
+        return f"Most of the strain is landing on **{low_label}**. Steady that first and the rest of the money picture gets easier to hold."
+    return f"Most of the strain is landing on **{low_label}**. The direction can be right while this part quietly drains it."
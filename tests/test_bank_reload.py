@@ -0,0 +1,101 @@
+import json
+import os
+import pickle
+
+import pytest
+
+import engine
+import question_bank
+from run_state import RunState
+
+QUESTIONS = {"Interpersonal": [{"id": "i01", "text": "?", "variable": "Baseline", "weight": 1.0}]}
+
+
+@pytest.fixture
+def bank_file(tmp_path, monkeypatch):
+    # engine reads a tmp questions.json, starting from nothing loaded
+    path = tmp_path / "questions.json"
+    monkeypatch.setattr(engine, "bank_mtime", lambda: question_bank.bank_mtime(path))
+    monkeypatch.setattr(engine, "load_question_bank", lambda: question_bank.load_question_bank(path))
+    monkeypatch.setattr(engine, "_bank_state", (None, {}, {}))
+    monkeypatch.setattr(engine, "_bank_failed", None)
+    return path
+
+
+def write(path, text, tick):
+    # Distinct mtimes without sleeping
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(tick * 10**9, tick * 10**9))
+
+
+def test_bad_reloads_keep_the_last_good_bank(bank_file, caplog):
+    write(bank_file, json.dumps(QUESTIONS), 1)
+    good = engine.compiled_bank("Interpersonal")
+    assert good.ids == ("i01",)
+
+    # Half-written file, as an editor leaves it mid-save
+    write(bank_file, json.dumps(QUESTIONS)[:20], 2)
+    assert engine.compiled_bank("Interpersonal") is good
+    assert engine.bank_version() == 1 * 10**9
+    assert "reload failed" in caplog.text
+
+    # Parses, but a question names an unknown variable
+    write(bank_file, json.dumps({"Interpersonal": [{"id": "i01", "variable": "Nope"}]}), 3)
+    assert engine.compiled_bank("Interpersonal") is good
+
+    bank_file.unlink()
+    assert engine.compiled_bank("Interpersonal") is good
+
+    # A good save is picked up again
+    more = {"Interpersonal": QUESTIONS["Interpersonal"] + [{"id": "i02", "text": "?", "variable": "Clarity"}]}
+    write(bank_file, json.dumps(more), 4)
+    assert engine.compiled_bank("Interpersonal").ids == ("i01", "i02")
+
+
+def test_first_load_failure_raises(bank_file):
+    write(bank_file, "{", 1)
+    with pytest.raises(ValueError):
+        engine.question_bank()
+
+
+def question(qid, variable):
+    return {"id": qid, "text": f"{qid}?", "variable": variable, "weight": 1.0}
+
+
+BANK = {"Interpersonal": [question("i01", "Baseline"), question("i02", "Clarity"), question("i03", "Execution"), question("i04", "Baseline")]}
+
+
+def pickled_run():
+    run = RunState(engine.compiled_bank("Interpersonal"), [1, 3])
+    run.set_answer(0, 4)
+    run.set_answer(1, 0)
+    run.set_followups([2])
+    run.set_followup_answer(0, 1)
+    running = engine.RunningScores(run.bank)
+    for p, a in zip(run.base, run.base_answers):
+        running.set_position(p, a)
+    return pickle.dumps(run), pickle.dumps(running)
+
+
+def test_restored_runs_follow_their_questions_through_a_reorder(bank_file):
+    write(bank_file, json.dumps(BANK), 1)
+    run_blob, running_blob = pickled_run()
+
+    # Reordered, with a question inserted ahead of the asked ones
+    edited = {"Interpersonal": [question("i00", "Clarity")] + BANK["Interpersonal"][::-1]}
+    write(bank_file, json.dumps(edited), 2)
+    run, running = pickle.loads(run_blob), pickle.loads(running_blob)
+    assert run.bank is engine.compiled_bank("Interpersonal")
+    assert run.answers() == {"i02": 4, "i04": 0}
+    assert [(q["id"], a) for q, a in run.answered_followups()] == [("i03", 1)]
+    assert running.answers() == {"i02": 4, "i04": 0}
+
+
+def test_restoring_a_removed_question_raises(bank_file):
+    write(bank_file, json.dumps(BANK), 1)
+    run_blob, running_blob = pickled_run()
+
+    write(bank_file, json.dumps({"Interpersonal": BANK["Interpersonal"][:3]}), 2)
+    for blob in (run_blob, running_blob):
+        with pytest.raises(ValueError, match="'i04' is no longer in the 'Interpersonal' bank"):
+            pickle.loads(blob)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from batch import UNANSWERED, ZONES, score_matrix
+from engine import VARIABLES, compiled_bank, compute_scores
+
+LENSES = ["Interpersonal", "Financial", "Big Picture"]
+
+
+@pytest.mark.parametrize("lens", LENSES)
+def test_score_matrix_matches_compute_scores(lens):
+    cb = compiled_bank(lens)
+    rng = np.random.default_rng(0)
+    n = 5000
+    # Random partial answer sets (about a third of the bank each), plus edge cases
+    answers = rng.integers(0, 5, size=(n, len(cb)), dtype=np.int8)
+    answers[rng.random((n, len(cb))) < 0.66] = UNANSWERED
+    answers[0] = UNANSWERED
+    answers[1] = 2
+
+    got = score_matrix(answers, lens=lens)
+    edges = 0
+    for i in range(n):
+        row = {cb.ids[j]: int(a) for j, a in enumerate(answers[i]) if a != UNANSWERED}
+        overall, per_variable, _scored = compute_scores(cb.questions, row)
+        assert got["overall"][i] == pytest.approx(overall, abs=1e-9)
+        for k, v in enumerate(VARIABLES):
+            info = per_variable.get(v)
+            if info is None:
+                assert np.isnan(got["pct"][i, k]) and got["zone"][i, k] == -1
+                continue
+            assert got["pct"][i, k] == pytest.approx(info["pct"], abs=1e-9)
+            assert got["volatility"][i, k] == pytest.approx(info["volatility"], abs=1e-9)
+            assert ZONES[got["zone"][i, k]] == info["zone"], (i, v, info["pct"])
+            edges += info["pct"] in (45.0, 70.0)
+    # The 45/70 cut points themselves are hit, so zoning there is actually checked
+    assert edges
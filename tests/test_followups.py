@@ -0,0 +1,16 @@
+import random
+
+from engine import CompiledBank, pick_followup_positions
+
+
+def test_zero_weight_questions_come_last():
+    # 30 in-target questions, a third of them weight 0; the rest of the bank elsewhere
+    questions = [
+        {"id": f"q{i}", "variable": "Baseline" if i < 30 else "Clarity", "weight": 0 if i % 3 == 0 else 1.0}
+        for i in range(200)
+    ]
+    cb = CompiledBank("test", questions)
+    for n, zero in ((10, 0), (25, 5)):
+        picked = pick_followup_positions(cb, ["Baseline"], set(), n, random.Random(n))
+        assert len(set(picked)) == n
+        assert sum(cb.weights[p] == 0 for p in picked) == zero
@@ -0,0 +1,64 @@
+import json
+import logging
+
+import pytest
+
+import baseline_lens_text as baseline
+import lens_text
+from engine import VARIABLES
+
+LENSES = ["Interpersonal", "Financial", "Big Picture", "Unknown lens"]
+ZONES = ["RED", "YELLOW", "GREEN"]
+
+
+@pytest.mark.parametrize("lens", LENSES)
+def test_lookups_match_the_baseline(lens):
+    for var in VARIABLES + ("Unknown variable",):
+        assert lens_text.variable_translation(lens, var) == baseline.variable_translation(lens, var)
+        assert lens_text.lens_translation(lens, var) == baseline.lens_translation(lens, var)
+        assert lens_text.pressure_focus_summary(lens, var) == baseline.pressure_focus_summary(lens, var)
+        assert lens_text.compassionate_summary(lens, var) == baseline.compassionate_summary(lens, var)
+    assert lens_text.lens_readout_intro(lens) == baseline.lens_readout_intro(lens)
+    if lens != "Unknown lens":
+        assert lens_text.lens_focus(lens) == baseline.lens_focus(lens)
+
+
+def test_zone_lookups_match_the_baseline():
+    for zone in ZONES:
+        assert lens_text.zone_message(zone) == baseline.zone_message(zone)
+    for zone in ZONES + ["PURPLE"]:
+        assert lens_text.compassionate_zone_line(zone) == baseline.compassionate_zone_line(zone)
+
+
+@pytest.fixture
+def locale_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lens_text, "LOCALE_DIR", tmp_path)
+    monkeypatch.setattr(lens_text, "_catalogs", {None: lens_text._catalogs[None]})
+    return tmp_path
+
+
+def test_locale_overlays_english(locale_dir):
+    overrides = {
+        "zone_message": {"RED": "kaputt"},
+        "variable": {"Financial": {"Baseline": "Stabilität"}},
+        "pressure_summary": {"*": "Druck auf **{var}**."},
+    }
+    (locale_dir / "de.json").write_text(json.dumps(overrides), encoding="utf-8")
+    assert lens_text.zone_message("RED", "de") == "kaputt"
+    assert lens_text.zone_message("GREEN", "de") == baseline.zone_message("GREEN")
+    assert lens_text.variable_translation("Financial", "Baseline", "de") == "Stabilität"
+    # A lens entry overlays key by key, the rest of that lens stays English
+    assert lens_text.variable_translation("Financial", "Clarity", "de") == baseline.variable_translation("Financial", "Clarity")
+    assert lens_text.pressure_focus_summary("Unknown lens", "X", "de") == "Druck auf **X**."
+    assert lens_text.pressure_focus_summary("Financial", "X", "de") == baseline.pressure_focus_summary("Financial", "X")
+    assert lens_text.catalog("de") is lens_text.catalog("de")
+
+
+@pytest.mark.parametrize("content", [None, "{not json", "[1, 2]"])
+def test_unusable_locale_falls_back_to_english_once(locale_dir, caplog, content):
+    if content is not None:
+        (locale_dir / "xx.json").write_text(content, encoding="utf-8")
+    with caplog.at_level(logging.WARNING, logger=lens_text.__name__):
+        for _ in range(3):
+            assert lens_text.zone_message("RED", "xx") == baseline.zone_message("RED")
+    assert caplog.text.count("locale 'xx' unavailable") == 1
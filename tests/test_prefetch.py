@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import prefetch
+from engine import compiled_bank
+from metrics import FOLLOWUP_PREFETCH
+from prefetch import FollowupPrefetch, pick_round
+
+
+def count(result):
+    return dict((labels[0], value) for _name, labels, _extra, value in FOLLOWUP_PREFETCH.samples()).get(result, 0)
+
+
+def inputs(targets=("Baseline", "Clarity"), asked=range(10), round_no=0):
+    return compiled_bank("Interpersonal"), list(targets), set(asked), 10, 12345, round_no
+
+
+@pytest.mark.parametrize("round_no", [0, 1, 2])
+def test_prefetched_round_equals_the_on_click_pick(round_no):
+    args = inputs(round_no=round_no)
+    prefetched = FollowupPrefetch()
+    prefetched.submit(*args)
+    before = count("miss")
+    got = prefetched.result(*args)
+    assert count("miss") == before
+    assert got == pick_round(*args) == FollowupPrefetch().result(*args)
+
+
+def test_changed_inputs_miss():
+    prefetched = FollowupPrefetch()
+    prefetched.submit(*inputs())
+    future = prefetched.future
+    if future is not None:
+        future.result()
+    for changed in (inputs(targets=("Execution",)), inputs(asked=range(11)), inputs(round_no=1)):
+        before = count("miss")
+        assert prefetched.result(*changed) == pick_round(*changed)
+        assert count("miss") == before + 1
+
+
+def test_superseded_pick_is_cancelled(monkeypatch):
+    # One busy worker: the first pick is still queued when the inputs change
+    pool = ThreadPoolExecutor(1)
+    monkeypatch.setattr(prefetch, "_pool", pool)
+    release = threading.Event()
+    pool.submit(release.wait)
+    try:
+        prefetched = FollowupPrefetch()
+        prefetched.submit(*inputs())
+        first = prefetched.future
+        prefetched.submit(*inputs(asked=range(11)))
+        assert first.cancelled()
+        assert prefetched.future is not first
+    finally:
+        release.set()
+    assert prefetched.result(*inputs(asked=range(11))) == pick_round(*inputs(asked=range(11)))
+    pool.shutdown()
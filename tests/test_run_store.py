@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+
+import run_store
+from run_store import RunStore, run_row
+
+READOUT = {
+    "lens": "Financial",
+    "overall": 50.0,
+    "targets": ["Baseline"],
+    "per_variable": {
+        "Baseline": {"pct": 40.0, "zone": "RED", "volatility": 10.0, "n": 2},
+        "Clarity": {"pct": 60.0, "zone": "YELLOW", "volatility": 0.0, "n": 1},
+    },
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(tmp_path / "runs.db", max_wait=0.01)
+    yield store
+    store.close()
+
+
+def counts(store):
+    conn = run_store.connect(store.path)
+    try:
+        return tuple(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("run", "answer", "variable_score"))
+    finally:
+        conn.close()
+
+
+def test_save_and_flush_write_every_table(store):
+    store.save(run_row(READOUT, "after_25", {"f01": 1, "f02": 3, "f03": 2}, session_id="s", seed=7))
+    store.flush()
+    assert counts(store) == (1, 3, 2)
+
+    conn = run_store.connect(store.path)
+    assert conn.execute("SELECT lens, phase, overall, targets, seed FROM run").fetchone() == ("Financial", "after_25", 50.0, '["Baseline"]', 7)
+    assert dict(conn.execute("SELECT qid, value FROM answer")) == {"f01": 1, "f02": 3, "f03": 2}
+    assert conn.execute("SELECT pct, zone, volatility, n FROM variable_score WHERE variable = 'Baseline'").fetchone() == (40.0, "RED", 10.0, 2)
+    conn.close()
+
+
+def test_failed_batch_is_logged_and_the_writer_keeps_going(store, caplog):
+    bad = run_row(dict(READOUT, lens=None), "after_25", {"f01": 1})  # run.lens is NOT NULL
+    with caplog.at_level(logging.ERROR, logger=run_store.__name__):
+        store.save(bad)
+        store.flush()
+    assert "dropped a batch of 1 runs" in caplog.text
+    assert counts(store) == (0, 0, 0)
+
+    store.save(run_row(READOUT, "after_25", {"f01": 1}))
+    store.flush()
+    assert counts(store) == (1, 1, 2)
+
+
+def test_close_drains_the_queue(tmp_path):
+    store = RunStore(tmp_path / "runs.db", batch_size=7)
+    for i in range(50):
+        store.save(run_row(READOUT, "after_25", {"f01": i % 5}, created_at=float(i)))
+    store.close()
+    assert not store._thread.is_alive()
+    assert counts(store) == (50, 50, 100)
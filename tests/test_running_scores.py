@@ -0,0 +1,100 @@
+import pickle
+import random
+
+import pytest
+
+import engine
+from engine import RunningScores, build_readout, compiled_bank
+from readout_cache import answer_vector
+
+LENSES = ["Interpersonal", "Financial", "Big Picture"]
+
+
+def _same(running_readout, full_readout, top=5):
+    # RunningScores keeps only the `top` weakest signals; everything else must match build_readout
+    expected = dict(full_readout, signals=full_readout["signals"][:top])
+    assert running_readout.keys() == expected.keys()
+    for key in expected:
+        assert running_readout[key] == expected[key], key
+
+
+def _answer(rng, running, cb, k):
+    # k random answers in random order; returns (questions in bank order, {qid: answer}) as build_readout takes them
+    answers = {}
+    for p in rng.sample(range(len(cb)), k):
+        q = cb.questions[p]
+        a = rng.randint(0, engine.SCALE_MAX)
+        running.set(q, a)
+        answers[q["id"]] = a
+    return [cb.questions[p] for p in sorted(cb.positions(answers))], answers
+
+
+@pytest.mark.parametrize("lens", LENSES)
+@pytest.mark.parametrize("seed", range(20))
+def test_readout_matches_build_readout(lens, seed):
+    rng = random.Random(seed)
+    cb = compiled_bank(lens)
+    running = RunningScores(cb)
+    questions, answers = _answer(rng, running, cb, rng.randint(1, min(25, len(cb))))
+    _same(running.readout(lens), build_readout(lens, questions, answers))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_readout_after_reanswers_and_removes(seed):
+    # Re-answering keeps the question's place; removing drops it, like the follow-up round reset does
+    rng = random.Random(seed)
+    lens = "Interpersonal"
+    cb = compiled_bank(lens)
+    running = RunningScores(cb)
+    questions, answers = _answer(rng, running, cb, 20)
+    for q in rng.sample(questions, 6):
+        answers[q["id"]] = rng.randint(0, engine.SCALE_MAX)
+        running.set(q, answers[q["id"]])
+    for q in rng.sample(questions, 4):
+        del answers[q["id"]]
+        running.remove(q["id"])
+    questions = [q for q in questions if q["id"] in answers]
+    _same(running.readout(lens), build_readout(lens, questions, answers))
+    assert running.answers() == answers
+    assert running.answer_vector() == answer_vector(answers)
+
+
+def test_pickle_round_trip():
+    rng = random.Random(7)
+    lens = "Financial"
+    cb = compiled_bank(lens)
+    running = RunningScores(cb)
+    _answer(rng, running, cb, 25)
+    restored = pickle.loads(pickle.dumps(running))
+    assert restored.bank is cb
+    assert list(restored.answers().items()) == list(running.answers().items())
+    assert restored.readout(lens) == running.readout(lens)
+
+
+@pytest.mark.parametrize("lens", LENSES)
+def test_readout_does_not_depend_on_answer_order(lens):
+    # Readouts are cached by answer set: the same set answered in another order must read out the same.
+    # All 2s (the radio default) is the most tied, and most shared, answer set.
+    cb = compiled_bank(lens)
+    positions = list(range(min(25, len(cb))))
+    readouts = []
+    for seed in range(5):
+        running = RunningScores(cb)
+        random.Random(seed).shuffle(positions)
+        for p in positions:
+            running.set_position(p, 2)
+        readouts.append(running.readout(lens))
+    assert all(r == readouts[0] for r in readouts[1:])
+    assert all(list(r["per_variable"]) == list(readouts[0]["per_variable"]) for r in readouts)
+
+
+@pytest.mark.parametrize("lens", LENSES)
+def test_lowest_variable_leads_the_followup_targets(lens):
+    # All 2s ties every variable: the "failing most at" line and the follow-up focus must agree
+    cb = compiled_bank(lens)
+    running = RunningScores(cb)
+    for p in range(min(25, len(cb))):
+        running.set_position(p, 2)
+    readout = running.readout(lens)
+    assert readout["targets"][0] == readout["lowest"] == readout["ranking"][0]
+    assert readout["targets"] == readout["ranking"][: len(readout["targets"])]
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from engine import VARIABLE_WEIGHTS, VARIABLES, CompiledBank, compiled_bank, stratified_positions, variable_quotas
+
+
+def bank(sizes):
+    # {variable: question count} -> CompiledBank
+    questions = [{"id": f"{v}{i}", "variable": v} for v, n in sizes.items() for i in range(n)]
+    return CompiledBank("test", questions)
+
+
+@pytest.mark.parametrize("k", [0, 1, 6, 25, 60, 1000])
+@pytest.mark.parametrize("lens", ["Interpersonal", "Financial", "Big Picture"])
+def test_quotas_sum_and_caps(lens, k):
+    cb = compiled_bank(lens)
+    quotas = variable_quotas(cb, k)
+    assert sum(quotas.values()) == min(k, len(cb))
+    assert all(0 <= n <= len(cb.by_variable[v]) for v, n in quotas.items())
+
+
+@pytest.mark.parametrize("k", [1, 6, 13, 25, 59])
+def test_quotas_follow_weights_when_nothing_caps(k):
+    cb = bank(dict.fromkeys(VARIABLES, 100))
+    quotas = variable_quotas(cb, k)
+    total_w = sum(VARIABLE_WEIGHTS[v] for v in VARIABLES)
+    for v in VARIABLES:
+        # Largest remainder: never more than one off the exact share
+        assert abs(quotas[v] - k * VARIABLE_WEIGHTS[v] / total_w) < 1
+
+
+def test_quotas_share_out_what_a_small_variable_cannot_take():
+    sizes = dict.fromkeys(VARIABLES, 20)
+    sizes["Clarity"] = 1
+    quotas = variable_quotas(bank(sizes), 25)
+    assert quotas["Clarity"] == 1
+    assert sum(quotas.values()) == 25
+    # The rest split the other 24 by weight
+    rest = [v for v in VARIABLES if v != "Clarity"]
+    total_w = sum(VARIABLE_WEIGHTS[v] for v in rest)
+    for v in rest:
+        assert abs(quotas[v] - 24 * VARIABLE_WEIGHTS[v] / total_w) < 1
+
+
+@pytest.mark.parametrize("lens", ["Interpersonal", "Financial", "Big Picture"])
+def test_stratified_positions_replay_from_a_seed(lens):
+    cb = compiled_bank(lens)
+    first = stratified_positions(cb, 25, random.Random("seed/base"))
+    assert stratified_positions(cb, 25, random.Random("seed/base")) == first
+    assert len(set(first)) == len(first) == min(25, len(cb))
+    counts = {v: sum(VARIABLES[cb.var_codes[p]] == v for p in first) for v in VARIABLES}
+    assert {v: n for v, n in counts.items() if n} == {v: n for v, n in variable_quotas(cb, 25).items() if n}
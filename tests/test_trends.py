@@ -0,0 +1,146 @@
+import sqlite3
+
+import pytest
+
+import run_store
+from run_store import init_db, run_row, write_runs
+from trends import TREND_PHASE, handle_salt, history, load_trend, rebuild_trends, user_key
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = run_store.connect(tmp_path / "runs.db")
+    init_db(conn)
+    yield conn
+    conn.close()
+
+
+def row(user_id, created_at, scores, phase=TREND_PHASE, lens="Financial"):
+    # A run_row for {variable: pct}; overall is their mean
+    readout = {
+        "lens": lens,
+        "overall": sum(scores.values()) / len(scores),
+        "targets": [min(scores, key=scores.get)],
+        "per_variable": {v: {"pct": pct, "zone": "RED", "volatility": 0.0, "n": 1} for v, pct in scores.items()},
+    }
+    return run_row(readout, phase, {}, session_id="s", created_at=created_at, user_id=user_id)
+
+
+RUNS = [
+    (1.0, {"Baseline": 40.0, "Clarity": 60.0}),
+    (2.0, {"Baseline": 50.0, "Clarity": 45.0}),
+    (3.0, {"Baseline": 55.0, "Clarity": 35.0}),
+]
+
+
+def test_user_key():
+    salt = b"s" * 16
+    key = user_key("Sam ", salt)
+    assert key == user_key("sam", salt)
+    assert len(key) == 32 and int(key, 16) >= 0
+    assert key != user_key("sam", b"t" * 16)
+    assert user_key("", salt) is None and user_key("  ", salt) is None and user_key(None, salt) is None
+
+
+def test_handle_salt_is_created_once(conn):
+    salt = handle_salt(conn)
+    assert len(salt) == 16
+    assert handle_salt(conn) == salt
+    assert conn.execute("SELECT COUNT(*) FROM handle_salt").fetchone()[0] == 1
+
+
+def test_rollup_folds_trend_runs_only(conn):
+    write_runs(conn, [row("u", at, scores) for at, scores in RUNS])
+    # Neither follow-up readouts, adaptive runs nor anonymous runs are trend points
+    write_runs(conn, [row("u", 4.0, {"Baseline": 0.0}, phase="after_25_plus_10"), row("u", 5.0, {"Baseline": 0.0}, phase="adaptive")])
+    write_runs(conn, [row(None, 6.0, {"Baseline": 0.0})])
+
+    trend = load_trend(conn, "u", "Financial")
+    assert trend["runs"] == 3
+    assert trend["first_at"] == 1.0 and trend["last_at"] == 3.0
+    assert trend["last"] == RUNS[2][1] and trend["prev"] == RUNS[1][1]
+    assert trend["last_overall"] == 45.0 and trend["prev_overall"] == 47.5
+    assert trend["recent_lowest"] == ["Clarity", "Clarity", "Baseline"]
+    assert trend["lowest_streak"] == 2
+    assert load_trend(conn, "u", "Interpersonal") is None
+    assert [at for at, _overall, _scores in history(conn, "u", "Financial")] == [3.0, 2.0, 1.0]
+
+
+def load_after(conn, runs):
+    # Write runs one batch each, in the given order; the trend without its run id
+    for at, scores in runs:
+        write_runs(conn, [row("u", at, scores)])
+    trend = load_trend(conn, "u", "Financial")
+    trend.pop("last_run_id")
+    return trend
+
+
+def test_out_of_order_runs_refold_in_time_order(conn):
+    in_order = load_after(conn, RUNS)
+    conn.execute("DELETE FROM trend")
+    conn.execute("DELETE FROM run")
+    # The newest run is written first, e.g. by another writer process
+    assert load_after(conn, [RUNS[2], RUNS[0], RUNS[1]]) == in_order
+
+
+def test_rebuild_trends_matches_incremental(conn):
+    write_runs(conn, [row("u", at, scores) for at, scores in RUNS] + [row("v", 9.0, {"Feedback": 10.0})])
+    before = {u: load_trend(conn, u, lens) for u, lens in (("u", "Financial"), ("v", "Financial"))}
+    rebuild_trends(conn)
+    assert {u: load_trend(conn, u, lens) for u, lens in (("u", "Financial"), ("v", "Financial"))} == before
+
+
+V1_RUN = """
+CREATE TABLE run (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT,
+    lens TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    overall REAL NOT NULL,
+    targets TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def columns(conn):
+    return [r[1] for r in conn.execute("PRAGMA table_info(run)")]
+
+
+def test_migrate_v1(tmp_path):
+    conn = sqlite3.connect(tmp_path / "v1.db")
+    conn.executescript(V1_RUN)
+    conn.execute("INSERT INTO run (lens, phase, overall, targets, created_at) VALUES ('Financial', 'after_25', 50, '[]', 1)")
+    conn.execute("PRAGMA user_version=1")
+    conn.commit()
+
+    init_db(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == run_store.SCHEMA_VERSION
+    assert {"user_id", "seed"} <= set(columns(conn))
+    assert conn.execute("SELECT lens, user_id, seed FROM run").fetchall() == [("Financial", None, None)]
+    write_runs(conn, [row("u", 2.0, {"Baseline": 40.0})])
+    assert load_trend(conn, "u", "Financial")["runs"] == 1
+
+
+def test_migrate_v2_drops_unsalted_user_keys(tmp_path):
+    conn = sqlite3.connect(tmp_path / "v2.db")
+    conn.executescript(V1_RUN)
+    conn.execute("ALTER TABLE run ADD COLUMN user_id TEXT")
+    conn.execute("CREATE TABLE trend (user_id TEXT NOT NULL, lens TEXT NOT NULL, runs INTEGER NOT NULL, last_at REAL NOT NULL, data TEXT NOT NULL, PRIMARY KEY (user_id, lens)) WITHOUT ROWID")
+    conn.execute("INSERT INTO run (user_id, lens, phase, overall, targets, created_at) VALUES ('sha', 'Financial', 'after_25', 50, '[]', 1)")
+    conn.execute("INSERT INTO trend VALUES ('sha', 'Financial', 1, 1, '{}')")
+    conn.execute("PRAGMA user_version=2")
+    conn.commit()
+
+    init_db(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == run_store.SCHEMA_VERSION
+    assert conn.execute("SELECT user_id FROM run").fetchall() == [(None,)]
+    assert conn.execute("SELECT COUNT(*) FROM trend").fetchone()[0] == 0
+    assert "seed" in columns(conn)
+
+
+def test_init_db_is_idempotent(conn):
+    write_runs(conn, [row("u", 1.0, {"Baseline": 40.0})])
+    init_db(conn)
+    assert conn.execute("SELECT user_id FROM run").fetchall() == [("u",)]
+    assert load_trend(conn, "u", "Financial")["runs"] == 1
@@ -0,0 +1,65 @@
+import json
+import random
+
+import pytest
+
+import trifactor
+from engine import build_readout, compiled_bank, readout_summary
+from trifactor import score_lines, score_record
+
+
+def record(lens, seed, k=25):
+    rng = random.Random(seed)
+    cb = compiled_bank(lens)
+    ids = rng.sample(cb.ids, min(k, len(cb)))
+    return {"lens": lens, "phase": "after_25", "seed": seed, "answers": {qid: rng.randint(0, 4) for qid in ids}}
+
+
+def test_score_record_recomputes_and_passes_other_keys_through():
+    rec = record("Financial", 1)
+    rec.update(overall=-1, targets=["stale"], session="abc")
+    out = score_record(rec)
+    cb = compiled_bank("Financial")
+    questions = [cb.questions[p] for p in sorted(cb.positions(rec["answers"]))]
+    expected = readout_summary(build_readout("Financial", questions, rec["answers"]))
+    assert {k: out[k] for k in expected} == expected
+    assert (out["phase"], out["seed"], out["session"]) == ("after_25", 1, "abc")
+    assert "answers" not in out and "unknown_ids" not in out
+
+
+def test_score_record_lists_unknown_ids():
+    rec = record("Interpersonal", 2, k=5)
+    rec["answers"].update({"nope1": 2, "f01": 3})  # f01 is a Financial id
+    out = score_record(rec)
+    assert out["unknown_ids"] == ["nope1", "f01"]
+    assert sum(info["n"] for info in out["variables"].values()) == 5
+
+
+def test_score_lines_reports_bad_lines_and_keeps_going():
+    lines = [
+        (1, json.dumps(record("Financial", 3))),
+        (2, "{not json"),
+        (3, json.dumps({"lens": "Nope", "answers": {}})),
+        (4, json.dumps({"lens": "Financial"})),
+        (5, json.dumps(record("Big Picture", 4))),
+    ]
+    out, errors = score_lines(lines)
+    assert [json.loads(line)["lens"] for line in out] == ["Financial", "Big Picture"]
+    assert [e.split(":")[0] for e in errors] == ["line 2", "line 3", "line 4"]
+    assert "JSONDecodeError" in errors[0] and "unknown lens 'Nope'" in errors[1] and "KeyError" in errors[2]
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_workers_give_the_same_output(tmp_path, capsys, workers):
+    src = tmp_path / "runs.jsonl"
+    recs = [record(lens, i) for i in range(30) for lens in ("Interpersonal", "Financial", "Big Picture")]
+    src.write_text("\n".join(map(json.dumps, recs)) + "\n\n{bad\n", encoding="utf-8")
+
+    outputs = []
+    for args in (["--workers", "1"], ["--workers", str(workers), "--chunk-size", "7"]):
+        dst = tmp_path / f"out-{len(outputs)}.jsonl"
+        assert trifactor.main(["score", str(src), "-o", str(dst), *args]) == 1  # the bad line fails
+        outputs.append(dst.read_text(encoding="utf-8"))
+        assert "scored 90 runs, 1 failed" in capsys.readouterr().err
+    assert outputs[0] == outputs[1]
+    assert len(outputs[0].splitlines()) == 90
@@ -0,0 +1,158 @@
+import hashlib
+import hmac
+import json
+import secrets
+
+# =========================================================
+# Weekly trends over stored runs (no Streamlit)
+# - One rollup row per (user, lens), updated as each run is written
+# - Reading a trend is a primary-key lookup, never a scan of past runs
+# - Only the first readout of a fixed 25-question diagnostic ("after_25") is
+#   a trend point, so every point is scored on the same footing. Adaptive
+#   runs are saved under their own phases and never enter a trend
+# - Users are keyed by an HMAC of their handle under a random per-deployment
+#   salt kept in the database. Anyone who enters the same handle on the same
+#   deployment sees its trend, so a handle works like a password
+# =========================================================
+
+TREND_PHASE = "after_25"
+TREND_WINDOW = 8  # how many recent lowest variables to keep
+
+TREND_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trend (
+    user_id TEXT NOT NULL,
+    lens TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    last_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, lens)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS handle_salt (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    salt BLOB NOT NULL
+);
+"""
+
+
+def handle_salt(conn):
+    # This deployment's salt, created on first use; the first of several racing processes wins
+    with conn:
+        conn.execute("INSERT OR IGNORE INTO handle_salt (id, salt) VALUES (0, ?)", (secrets.token_bytes(16),))
+    return conn.execute("SELECT salt FROM handle_salt WHERE id = 0").fetchone()[0]
+
+
+def new_handle():
+    # A random handle to offer instead of a guessable name
+    return secrets.token_hex(8)
+
+
+def user_key(handle, salt):
+    # Stable id for a user-entered handle on one deployment ("" -> None).
+    # Only as private as the handle: a guessable one is guessable through the UI.
+    handle = (handle or "").strip().lower()
+    if not handle:
+        return None
+    return hmac.new(salt, handle.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def apply_run(trend, overall, scores, created_at, run_id=None):
+    """Fold one run into a rollup dict (None = no runs yet) and return the new one.
+
+    scores: {variable: pct} for this run.
+    """
+    lowest = min(scores, key=scores.get) if scores else None
+    t = trend or {"runs": 0, "first_at": created_at, "last": {}, "last_overall": None, "recent_lowest": [], "lowest_streak": 0}
+    same = bool(t["recent_lowest"]) and t["recent_lowest"][0] == lowest
+    return {
+        "runs": t["runs"] + 1,
+        "first_at": t["first_at"],
+        "last_at": created_at,
+        "last_run_id": run_id,
+        "prev": t["last"],
+        "last": dict(scores),
+        "prev_overall": t["last_overall"],
+        "last_overall": overall,
+        "recent_lowest": ([lowest] + t["recent_lowest"])[:TREND_WINDOW],
+        "lowest_streak": t["lowest_streak"] + 1 if same else 1,
+    }
+
+
+def deltas(trend):
+    # {variable: change in pct since the previous run}
+    prev = trend.get("prev") or {}
+    return {v: pct - prev[v] for v, pct in trend["last"].items() if v in prev}
+
+
+def load_trend(conn, user_id, lens):
+    row = conn.execute("SELECT data FROM trend WHERE user_id = ? AND lens = ?", (user_id, lens)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_trend(conn, user_id, lens, trend):
+    conn.execute(
+        "INSERT INTO trend (user_id, lens, runs, last_at, data) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (user_id, lens) DO UPDATE SET runs = excluded.runs, last_at = excluded.last_at, data = excluded.data",
+        (user_id, lens, trend["runs"], trend["last_at"], json.dumps(trend)),
+    )
+
+
+def apply_row(trend, row, run_id=None):
+    # Same as apply_run, for a run_store.run_row dict
+    scores = {v: vals[0] for v, vals in row["variables"].items()}
+    return apply_run(trend, row["overall"], scores, row["created_at"], run_id)
+
+
+def record_run(conn, row, run_id):
+    # Called by the run store writer inside its batch transaction
+    if row.get("user_id") is None or row["phase"] != TREND_PHASE:
+        return
+    trend = load_trend(conn, row["user_id"], row["lens"])
+    if trend is not None and row["created_at"] < trend["last_at"]:
+        # Arrived out of order (several writers): refold this user's runs in time order
+        rebuild_trend(conn, row["user_id"], row["lens"])
+        return
+    save_trend(conn, row["user_id"], row["lens"], apply_row(trend, row, run_id))
+
+
+def history(conn, user_id, lens, limit=52):
+    """Newest-first [(created_at, overall, {variable: pct})] — index range scan, capped at `limit` runs."""
+    runs = conn.execute(
+        "SELECT id, created_at, overall FROM run WHERE user_id = ? AND lens = ? AND phase = ? "
+        "ORDER BY created_at DESC, id DESC LIMIT ?",
+        (user_id, lens, TREND_PHASE, limit),
+    ).fetchall()
+    if not runs:
+        return []
+    scores = {run_id: {} for run_id, _at, _o in runs}
+    marks = ",".join("?" * len(runs))
+    for run_id, v, pct in conn.execute(
+        f"SELECT run_id, variable, pct FROM variable_score WHERE run_id IN ({marks})", list(scores)
+    ):
+        scores[run_id][v] = pct
+    return [(at, overall, scores[run_id]) for run_id, at, overall in runs]
+
+
+def rebuild_trend(conn, user_id, lens):
+    # Recompute one rollup from its stored runs
+    trend = None
+    runs = conn.execute(
+        "SELECT id, overall, created_at FROM run WHERE user_id = ? AND lens = ? AND phase = ? ORDER BY created_at, id",
+        (user_id, lens, TREND_PHASE),
+    )
+    for run_id, overall, created_at in runs.fetchall():
+        scores = dict(conn.execute("SELECT variable, pct FROM variable_score WHERE run_id = ?", (run_id,)).fetchall())
+        trend = apply_run(trend, overall, scores, created_at, run_id)
+    if trend is not None:
+        save_trend(conn, user_id, lens, trend)
+
+
+def rebuild_trends(conn):
+    # Recompute every rollup from stored runs (after a migration or a rescore)
+    with conn:
+        conn.execute("DELETE FROM trend")
+        keys = conn.execute(
+            "SELECT DISTINCT user_id, lens FROM run WHERE user_id IS NOT NULL AND phase = ?", (TREND_PHASE,)
+        ).fetchall()
+        for user_id, lens in keys:
+            rebuild_trend(conn, user_id, lens)
@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# =========================================================
+# Trifactor command line (no Streamlit)
+#   python trifactor.py score runs.jsonl [-o readouts.jsonl]
+# - Input: one export dict per line ({"lens", "answers", "targets", ...})
+# - Output: one readout per line, extra input keys (phase, ids...) passed through
+# - Streams in chunks; memory stays flat however big the file is
+# =========================================================
+
+# Input keys that are recomputed rather than passed through
+SCORED_KEYS = {"lens", "answers", "overall", "variables", "targets"}
+
+
+def _init_worker(bank_path, weights):
+    # Runs once per worker process (and once in-process without --workers)
+    if bank_path:
+        os.environ["TRIFACTOR_BANK"] = bank_path
+    import engine
+
+    if weights:
+        engine.VARIABLE_WEIGHTS.update(weights)
+
+
+def score_record(record, top=5):
+    import engine
+    from readout_cache import answer_vector, cached_readout
+
+    lens = record["lens"]
+    if lens not in engine.question_bank():
+        raise KeyError(f"unknown lens {lens!r}")
+    cb = engine.compiled_bank(lens)
+    answers = {str(qid): int(a) for qid, a in record["answers"].items()}
+    # Bank order, so equal items rank the same whatever order the answers came in
+    questions = [cb.questions[p] for p in sorted(cb.positions(answers))]
+
+    out = {k: v for k, v in record.items() if k not in SCORED_KEYS}
+    readout = cached_readout(lens, answer_vector(answers), lambda: engine.build_readout(lens, questions, answers), top=None)
+    out.update(engine.readout_summary(readout, top=top))
+    unknown = [qid for qid in answers if qid not in cb.index]
+    if unknown:
+        out["unknown_ids"] = unknown
+    return out
+
+
+def score_lines(numbered_lines, top=5):
+    # (line_no, raw line) -> (output lines, error messages); runs in workers
+    out, errors = [], []
+    for line_no, line in numbered_lines:
+        try:
+            out.append(json.dumps(score_record(json.loads(line), top=top), ensure_ascii=False))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            errors.append(f"line {line_no}: {type(e).__name__}: {e}")
+    return out, errors
+
+
+def _chunks(lines, size):
+    numbered = ((i, line) for i, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def cmd_score(args):
+    weights = None
+    if args.weights:
+        with open(args.weights, encoding="utf-8") as f:
+            weights = {k: float(v) for k, v in json.load(f).items()}
+
+    _init_worker(args.bank, None)
+    import engine
+
+    unknown_vars = set(weights or ()) - set(engine.VARIABLES)
+    if unknown_vars:
+        sys.exit(f"--weights: unknown variables {sorted(unknown_vars)}")
+    _init_worker(args.bank, weights)
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    scored = failed = 0
+    try:
+        chunks = _chunks(src, args.chunk_size)
+
+        def emit(result):
+            nonlocal scored, failed
+            lines, errors = result
+            for line in lines:
+                dst.write(line + "\n")
+            for err in errors:
+                print(err, file=sys.stderr)
+            scored += len(lines)
+            failed += len(errors)
+
+        if args.workers > 1:
+            # Keep at most 2 chunks per worker in flight so memory stays bounded
+            with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args.bank, weights)) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(score_lines, chunk, args.top))
+                    if len(pending) >= 2 * args.workers:
+                        emit(pending.popleft().result())
+                while pending:
+                    emit(pending.popleft().result())
+        else:
+            for chunk in chunks:
+                emit(score_lines(chunk, args.top))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    print(f"scored {scored} runs, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="trifactor", description="Trifactor headless tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser("score", help="score a JSONL file of exported runs")
+    score.add_argument("input", help="JSONL file of export dicts, or - for stdin")
+    score.add_argument("-o", "--output", default="-", help="JSONL readouts (default: stdout)")
+    score.add_argument("--chunk-size", type=int, default=1000, help="records per chunk (default: 1000)")
+    score.add_argument("--workers", type=int, default=1, help="worker processes (default: 1, in-process)")
+    score.add_argument("--top", type=int, default=5, help="weakest signals to keep per readout (default: 5)")
+    score.add_argument("--bank", help="questions.json to score against (default: TRIFACTOR_BANK or bundled)")
+    score.add_argument("--weights", help="JSON file of VARIABLE_WEIGHTS overrides, e.g. {\"Baseline\": 1.3}")
+    score.set_defaults(func=cmd_score)
+
+    args = parser.parse_args(argv)
+    if getattr(args, "chunk_size", 1) < 1:
+        parser.error("--chunk-size must be >= 1")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())